@@ -0,0 +1,119 @@
+"""
+Startup benchmark of `tools/cli.py` subcommands.
+
+Every command is executed with `--help` under `python -X importtime`
+so only interpreter start and imports are measured. Per command it
+reports wall time, cumulative import time and the heaviest top level
+imports.
+
+Usage:
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --repeat 5 --json startup.json
+"""
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+import click
+
+CLI_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tools", "cli.py"
+)
+
+COMMANDS = [
+    ["changelog", "generate-milestone-changelog"],
+    ["changelog", "set-milestone-to-issue"],
+    ["changelog", "add-to-changelog-file"],
+    ["project", "prs-to-clickup"],
+    ["env", "set-python-version"],
+    ["repo", "get-latest-commit"],
+    ["milestones", "get-milestone-commit"],
+    ["milestones", "set-milestone-commit"],
+    ["versioning", "bump-version"],
+    ["versioning", "current-version"],
+    ["versioning", "bump-file-version"],
+]
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output
+
+    Args:
+        stderr (str): stderr of python process
+
+    Returns:
+        dict: top level module name mapped to cumulative time in us
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            # header line
+            continue
+        name = parts[2].rstrip()
+        # nested imports are indented by two spaces per level
+        if name.startswith("  "):
+            continue
+        top_level[name.strip()] = cumulative
+    return top_level
+
+
+def measure_command(command, repeat):
+    wall_times = []
+    imports = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", CLI_PATH, *command, "--help"],
+            capture_output=True, text=True
+        )
+        wall_times.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Command {' '.join(command)} failed: {proc.stderr[-500:]}")
+        imports = parse_importtime(proc.stderr)
+
+    return {
+        "command": " ".join(command),
+        "wall_ms": statistics.median(wall_times) * 1000,
+        "import_ms": sum(imports.values()) / 1000,
+        "top_imports": sorted(
+            ((name, us / 1000) for name, us in imports.items()),
+            key=lambda item: item[1], reverse=True
+        )[:5]
+    }
+
+
+@click.command()
+@click.option("--repeat", default=3, help="Runs per command (median)")
+@click.option(
+    "--json", "json_path", required=False, type=click.Path(),
+    help="Write results as json to the path"
+)
+def main(repeat, json_path):
+    results = []
+    for command in COMMANDS:
+        result = measure_command(command, repeat)
+        results.append(result)
+        top = ", ".join(f"{n} {ms:.1f}" for n, ms in result["top_imports"])
+        print(
+            f"{result['command']:<45} wall {result['wall_ms']:8.1f} ms"
+            f"  imports {result['import_ms']:8.1f} ms  [{top}]"
+        )
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
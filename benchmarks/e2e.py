@@ -0,0 +1,382 @@
+"""
+End-to-end performance benchmarks of cli commands and scripts.
+
+Every case runs as a fresh process against the local stand-in server
+(`stub_server.py`) filled with synthetic data of given scale (amount of
+pull requests, tags, issues and ClickUp tasks). Reported metrics:
+
+- wall time
+- API calls (requests received by stand-in server)
+- bytes transferred (response bodies)
+- peak RSS of the process
+
+API calls and bytes do not depend on the machine, they are compared to
+stored baseline and the run fails when any of them regresses over its
+threshold. Wall time is also reported relative to a reference process
+(`micro.reference_workload` in fresh interpreter) run right before each
+case. It and peak RSS are gated only with `--gate-time`, against baseline
+regenerated on the same machine, because they still depend on interpreter,
+library versions and load. Only Linux/macOS (uses `os.wait4`).
+
+Usage:
+    python benchmarks/e2e.py
+    python benchmarks/e2e.py --scale 1000 --scale 10000 --case bump-version
+    python benchmarks/e2e.py --update-baseline
+    python benchmarks/e2e.py --scale 1000 --gate-time
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+import importlib.util
+import click
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+TOOLS_CLI = os.path.join(ROOT_DIR, "tools", "cli.py")
+ISSUES_SCRIPT = os.path.join(
+    ROOT_DIR, "scripts", "github_issues_management",
+    "github_issues_to_clickup.py"
+)
+ORG_STATS_SCRIPT = os.path.join(
+    ROOT_DIR, "scripts", "github_org_activities",
+    "github_org_activities_stats.py"
+)
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline_e2e.json")
+
+sys.path.insert(0, BENCHMARKS_DIR)
+from stub_server import StubServer, SyntheticData  # noqa: E402
+
+TOOLS_REQUIRES = [
+    "click", "dotenv", "requests", "aiohttp", "mistune", "semver", "tomlkit"
+]
+
+# case name: (argv builder, required modules)
+CASES = {
+    "generate-milestone-changelog": (
+        lambda workdir: [
+            sys.executable, TOOLS_CLI,
+            "changelog", "generate-milestone-changelog",
+            "--milestone=next-patch", "--old-tag=3.0.0", "--new-tag=3.0.1"
+        ],
+        TOOLS_REQUIRES
+    ),
+    "bump-version": (
+        lambda workdir: [
+            sys.executable, TOOLS_CLI,
+            "versioning", "bump-version", "--type=release", "--part=patch"
+        ],
+        TOOLS_REQUIRES
+    ),
+    "prs-to-clickup": (
+        lambda workdir: [
+            sys.executable, TOOLS_CLI,
+            "project", "prs-to-clickup", "--milestone=next-patch"
+        ],
+        TOOLS_REQUIRES
+    ),
+    "sync-issues": (
+        lambda workdir: [
+            sys.executable, ISSUES_SCRIPT, "sync-issues",
+            "--remove-temp-files=true"
+        ],
+        TOOLS_REQUIRES + ["sklearn"]
+    ),
+    "org-activities-stats": (
+        # script writes its data files next to itself, so run a copy
+        lambda workdir: [
+            sys.executable, "-c",
+            "import asyncio, github_org_activities_stats as m; "
+            "asyncio.run(m.main(False))"
+        ],
+        ["dotenv", "requests", "aiohttp", "pandas", "pytz"]
+    ),
+}
+
+# fresh interpreter running fixed pure python workload, the unit
+# of `wall_ref`
+REFERENCE_ARGV = [
+    sys.executable, "-c",
+    "import micro\n"
+    "for _ in range(100):\n"
+    "    micro.reference_workload()"
+]
+REFERENCE_ROUNDS = 3
+
+# metric: default allowed ratio against baseline
+THRESHOLDS = {
+    "wall_ref": 1.5,
+    "peak_rss_mb": 1.5,
+    "api_calls": 1.05,
+    "bytes": 1.05,
+}
+TIME_METRICS = ["wall_ref", "peak_rss_mb"]
+
+
+def get_missing_modules(modules):
+    return [
+        name for name in modules
+        if importlib.util.find_spec(name) is None
+    ]
+
+
+def get_case_env(base_url, workdir):
+    env = dict(os.environ)
+    env.update({
+        "GITHUB_API_URL": base_url,
+        "CLICKUP_API_URL": f"{base_url}/api/v2",
+        "GITHUB_TOKEN": "benchmark",
+        "GITHUB_REPOSITORY_OWNER": "stub",
+        "GITHUB_REPOSITORY_NAME": "stub",
+        "GITHUB_ORGANIZATION": "stub",
+        "GITHUB_TEAM": "core",
+        "CLICKUP_API_KEY": "benchmark",
+        "CLICKUP_TEAM_ID": "1",
+        "CLICKUP_RELEASE_FIELD_ID": "release-field",
+        "CLICKUP_LIST_ID": "list0",
+        "CLICKUP_FOLDER_ID": "folder0",
+        "CLICKUP_ISSUETYPE_FIELD_ID": "type-field",
+        "CLICKUP_DOMAIN_FIELD_ID": "host-field",
+        "CI_TOOLS_CACHE_DIR": os.path.join(workdir, "cache"),
+        "PYTHONPATH": workdir,
+    })
+    env.pop("CI_TOOLS_DAEMON_SOCKET", None)
+    env.pop("CI_TOOLS_CASSETTE", None)
+    return env
+
+
+def run_process(argv, env, cwd, timeout):
+    """Run process and measure wall time and peak RSS
+
+    Returns:
+        tuple[int, float, float, str]: exit code, wall seconds,
+            peak rss in MB and tail of output
+    """
+    log_path = os.path.join(cwd, "output.log")
+    with open(log_path, "w") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            argv, env=env, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            _, status, rusage = os.wait4(proc.pid, 0)
+        finally:
+            timer.cancel()
+        wall = time.perf_counter() - start
+        # process is already reaped
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+    rss_mb = rusage.ru_maxrss / 1024
+    if sys.platform == "darwin":
+        # bytes on macOS
+        rss_mb /= 1024
+
+    with open(log_path, "r", errors="replace") as log:
+        tail = log.read()[-2000:]
+    return proc.returncode, wall, rss_mb, tail
+
+
+def measure_reference(timeout):
+    """Get best wall time of reference process
+
+    Returns:
+        float: seconds
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = BENCHMARKS_DIR
+    best = None
+    for _ in range(REFERENCE_ROUNDS):
+        exit_code, wall, _, tail = run_process(
+            REFERENCE_ARGV, env, tempfile.gettempdir(), timeout)
+        if exit_code != 0:
+            raise click.ClickException(f"Reference process failed:\n{tail}")
+        best = wall if best is None else min(best, wall)
+    return best
+
+
+def run_case(name, server, timeout):
+    get_argv, requires = CASES[name]
+    missing = get_missing_modules(requires)
+    if missing:
+        return {"status": "skipped", "reason": f"missing {missing}"}
+
+    reference = measure_reference(timeout)
+
+    workdir = tempfile.mkdtemp(prefix=f"ci-tools-bench-{name}-")
+    try:
+        shutil.copy(ORG_STATS_SCRIPT, workdir)
+        server.reset_stats()
+        exit_code, wall, rss_mb, tail = run_process(
+            get_argv(workdir),
+            get_case_env(server.base_url, workdir),
+            workdir,
+            timeout
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "status": "ok" if exit_code == 0 else "failed",
+        "wall_s": round(wall, 3),
+        "wall_ref": round(wall / reference, 3),
+        "api_calls": server.stats["requests"],
+        "bytes": server.stats["bytes"],
+        "peak_rss_mb": round(rss_mb, 1),
+    }
+    if exit_code != 0:
+        result["output"] = tail
+    return result
+
+
+def compare_to_baseline(results, baseline, thresholds):
+    """Get list of regressions against baseline
+
+    Returns:
+        list[str]: regression messages
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or result.get("status") != "ok":
+            continue
+        for metric, ratio in thresholds.items():
+            old = base.get(metric)
+            new = result.get(metric)
+            if not old or new is None:
+                continue
+            if new > old * ratio:
+                regressions.append(
+                    f"{key}: {metric} {old} -> {new} "
+                    f"(x{new / old:.2f} > x{ratio})"
+                )
+    return regressions
+
+
+@click.command()
+@click.option(
+    "--scale", "scales", multiple=True, type=click.INT,
+    default=[1000, 10000, 50000], show_default=True,
+    help="Amount of pull requests, tags, issues and tasks"
+)
+@click.option(
+    "--case", "cases", multiple=True, type=click.Choice(list(CASES)),
+    help="Run only selected cases"
+)
+@click.option(
+    "--baseline", "baseline_path", default=DEFAULT_BASELINE,
+    show_default=True, type=click.Path(),
+    help="Baseline json file"
+)
+@click.option(
+    "--update-baseline", is_flag=True, default=False,
+    help="Store results of this run into baseline"
+)
+@click.option(
+    "--gate-time", is_flag=True, default=False,
+    help=(
+        "Gate also wall time (relative to reference process) and peak RSS,"
+        " use with baseline regenerated on this machine"
+    )
+)
+@click.option(
+    "--time-threshold", default=THRESHOLDS["wall_ref"], show_default=True,
+    type=click.FLOAT, help="Allowed wall time and RSS ratio to baseline"
+)
+@click.option(
+    "--calls-threshold", default=THRESHOLDS["api_calls"], show_default=True,
+    type=click.FLOAT, help="Allowed API calls and bytes ratio to baseline"
+)
+@click.option(
+    "--timeout", default=900, show_default=True, type=click.INT,
+    help="Seconds before case is killed"
+)
+@click.option(
+    "--output", required=False, type=click.Path(),
+    help="Write results as json to the path"
+)
+def main(
+    scales, cases, baseline_path, update_baseline, gate_time,
+    time_threshold, calls_threshold, timeout, output
+):
+    cases = cases or list(CASES)
+    results = {}
+    for scale in scales:
+        server = StubServer(SyntheticData(
+            prs=scale, tags=scale, tasks=scale, issues=scale,
+            repos=max(5, scale // 1000), branches=max(20, scale // 100)
+        ))
+        server.start()
+        try:
+            for name in cases:
+                key = f"{name}@{scale}"
+                # fresh milestone state for every case
+                server.data.milestones[1]["description"] = ""
+                server.data.milestones[1]["title"] = "next-patch"
+                result = run_case(name, server, timeout)
+                results[key] = result
+                if result["status"] == "skipped":
+                    print(f"{key:<40} skipped ({result['reason']})")
+                    continue
+                print(
+                    f"{key:<40} {result['status']:<7}"
+                    f" wall {result['wall_s']:9.3f} s"
+                    f" (x{result['wall_ref']:7.2f} ref)"
+                    f"  calls {result['api_calls']:7}"
+                    f"  bytes {result['bytes']:11}"
+                    f"  rss {result['peak_rss_mb']:8.1f} MB"
+                )
+                if result["status"] == "failed":
+                    print(result["output"])
+        finally:
+            server.stop()
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=4)
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+
+    if update_baseline:
+        baseline.update({
+            key: {k: v for k, v in result.items() if k != "output"}
+            for key, result in results.items()
+            if result["status"] == "ok"
+        })
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline updated: {baseline_path}")
+        return
+
+    thresholds = {
+        "api_calls": calls_threshold,
+        "bytes": calls_threshold,
+    }
+    if gate_time:
+        thresholds.update({
+            metric: time_threshold for metric in TIME_METRICS
+        })
+    for key, result in results.items():
+        if result["status"] == "ok" and key not in baseline:
+            print(f"WARNING {key}: missing in baseline, not gated")
+        elif result["status"] == "skipped" and key in baseline:
+            print(f"WARNING {key}: in baseline but skipped, not gated")
+    regressions = compare_to_baseline(results, baseline, thresholds)
+    failed = [k for k, r in results.items() if r["status"] == "failed"]
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    for key in failed:
+        print(f"FAILED {key}")
+    if regressions or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
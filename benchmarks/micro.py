@@ -0,0 +1,549 @@
+"""
+Microbenchmarks of pure functions on hot paths.
+
+Every benchmark builds synthetic input of given size and times one call of
+the function. Sizes grow so the report shows how the function scales
+(`scaling` column is exponent between neighbouring sizes, 1.0 is linear,
+2.0 quadratic).
+
+Times are divided by time of a fixed pure python reference workload
+measured in rounds alternating with the benchmark, so the baseline holds
+ratios instead of absolute times and the comparison is meaningful across
+machines and under varying load. The run fails when ratio of any benchmark
+grows over threshold. Benchmarks whose module dependencies are not
+importable are skipped, a warning is printed when a skipped or measured
+benchmark is not gated against the baseline.
+
+Usage:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --benchmark sort_by_hosts --size 100 --size 5000
+    python benchmarks/micro.py --update-baseline
+"""
+import io
+import os
+import sys
+import json
+import math
+import timeit
+import contextlib
+import importlib.util
+import click
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline_micro.json")
+
+sys.path[0:0] = [
+    os.path.join(ROOT_DIR, "tools"),
+    os.path.join(ROOT_DIR, "scripts", "github_issues_management"),
+    os.path.join(ROOT_DIR, "scripts", "github_org_activities"),
+]
+
+HOSTS = [
+    "maya", "houdini", "ue", "3dsmax", "blender", "nuke", "fusion",
+    "tv paint", "after effects", "harmony", "photoshop", "hiero", "flame",
+    "resolve", "max", "substancepainter", "aftereffects", "unreal"
+]
+TYPES = ["feature", "enhancement", "bug", "refactor", "documentation", "other"]
+
+
+def _set_printer_context():
+    from utils import Printer
+
+    Printer.set_context(
+        click.Context(click.Command("micro"), obj={"DEBUG": False}))
+
+
+def _get_pr_body(paragraphs):
+    lines = ["## Changelog Description"]
+    for index in range(paragraphs):
+        lines.append(
+            f"Paragraph {index} with **strong** and _emphasis_ text "
+            f"referencing `code_{index}`.\nSecond line of paragraph."
+        )
+        lines.append(f"- item {index}\n- **bold item {index}**")
+    lines.append("```python\nprint('hello')\n```")
+    lines.append("## Testing notes:\n1. start host\n2. publish")
+    return "\n\n".join(lines)
+
+
+def _get_pr_kwargs(index):
+    return {
+        "title": f"Fix thing {index}",
+        "body": _get_pr_body(2),
+        "url": f"https://github.com/stub/stub/pull/{index}",
+        "number": index,
+        "labels": {"nodes": [
+            {"name": f"type: {TYPES[index % len(TYPES)]}"},
+            {"name": f"host: {HOSTS[index % len(HOSTS)]}"},
+            {"name": f"module: module{index % 7}"},
+        ]}
+    }
+
+
+def _get_changelog_processor(size):
+    from changelog import (
+        ChangeLogMilestoneProcessor,
+        PullRequestDescription,
+        SectionItems
+    )
+
+    # skip querying in __init__
+    processor = ChangeLogMilestoneProcessor.__new__(
+        ChangeLogMilestoneProcessor)
+    processor._pullrequests = [
+        PullRequestDescription(**_get_pr_kwargs(index))
+        for index in range(size)
+    ]
+    processor.sections = [
+        SectionItems(section.title, section.label)
+        for section in ChangeLogMilestoneProcessor.sections
+    ]
+    return processor
+
+
+def bench_get_body(size):
+    """Render of pull request body with `size` paragraphs"""
+    import changelog
+
+    pull = changelog.PullRequestDescription(**_get_pr_kwargs(0))
+    pull.body = _get_pr_body(size)
+
+    def run():
+        # measure rendering, not the render cache
+        changelog.PullRequestDescription._render_body.cache_clear()
+        pull.get_body()
+
+    return run
+
+
+def bench_flatten_markdown_paragraph(size):
+    """Flattening of parsed body with `size` paragraphs"""
+    import mistune
+    import changelog
+
+    pull = changelog.PullRequestDescription(**_get_pr_kwargs(0))
+    markdown_obj = mistune.create_markdown(renderer="ast")(
+        _get_pr_body(size))
+    paragraphs = [
+        el_ for el_ in markdown_obj
+        if el_["type"] in ["paragraph", "list", "block_code"]
+    ]
+    return lambda: pull._flatten_markdown_paragraph(paragraphs)
+
+
+def bench_populate_sections(size):
+    """Dividing of `size` pull requests into sections"""
+    processor = _get_changelog_processor(size)
+
+    def run():
+        for section in processor.sections:
+            section.pulls = []
+        processor._populate_sections()
+
+    return run
+
+
+def bench_sort_by_hosts(size):
+    """Ordering of `size` pull requests in sections by hosts"""
+    processor = _get_changelog_processor(size)
+    processor._populate_sections()
+    populated = [list(section.pulls) for section in processor.sections]
+
+    def run():
+        for section, pulls in zip(processor.sections, populated):
+            section.pulls = list(pulls)
+        processor._sort_by_hosts()
+
+    return run
+
+
+def bench_filter_versions(size):
+    """Matching of pyproject constraint in `size` pyenv versions"""
+    from environment import _filter_versions
+
+    versions = []
+    for index in range(size):
+        minor = 5 + index % 8
+        patch = index // 8
+        versions.append(f"  3.{minor}.{patch}")
+        if index % 4 == 0:
+            versions.append(f"  3.{minor}.{patch}rc1")
+    return lambda: _filter_versions(versions, ">=3.9.1,<3.10")
+
+
+def bench_select_python_version(size):
+    """Constraint resolution in index of `size` python versions"""
+    from environment import (
+        PythonVersionIndex,
+        VersionConstraint,
+        parse_python_versions
+    )
+
+    lines = [
+        f"  3.{5 + index % 8}.{index // 8}" for index in range(size)]
+    index = PythonVersionIndex(parse_python_versions(lines))
+    return lambda: VersionConstraint(">=3.9.1,<3.10").select(index)
+
+
+def bench_truncate_issue_body(size):
+    """Cutting of issue body with `size` repeated header blocks"""
+    from github_issues_to_clickup import _truncate_issue_body
+
+    blocks = []
+    for index in range(size):
+        blocks.extend([
+            "### Current Behavior:",
+            f"Something is broken {index}.",
+            "### Expected Behavior:",
+            "_No response_",
+            "### Steps To Reproduce:",
+            f"1. open\n2. click {index}",
+        ])
+    issue = {"body": "\n".join(blocks) + "\n[cuID:abc123]"}
+    return lambda: _truncate_issue_body(issue)
+
+
+def bench_get_custom_fields_from_labels(size):
+    """Mapping of issue labels to `size` ClickUp field options"""
+    import github_issues_to_clickup as issues
+
+    issues.CTX.cu_custom_attributes["type"]["options"] = {
+        f"type option {index}": index for index in range(size)
+    }
+    issues.CTX.cu_custom_attributes["host"]["options"] = {
+        f"host option {index}": index for index in range(size)
+    }
+    issue = {"labels": {"edges": [
+        {"node": {"name": "type: option 1"}},
+        {"node": {"name": "host: option 2"}},
+        {"node": {"name": "community"}},
+    ]}}
+    return lambda: issues._get_custom_fields_from_labels(issue)
+
+
+def _get_org_pull(index):
+    def edges(amount):
+        return {"edges": [{"node": {"id": n}} for n in range(amount)]}
+
+    return {
+        "author": {"login": f"user{index % 10}"},
+        "url": f"https://github.com/stub/repo/pull/{index}",
+        "assignees": edges(index % 2),
+        "reviews": edges(index % 3),
+        "participants": edges(index % 4),
+        "reviewRequests": edges(index % 2),
+        "labels": edges(index % 5),
+        "headRefName": f"bugfix/thing_{index}",
+        "authorAssociation": "MEMBER",
+        "changedFiles": index % 40,
+        "totalCommentsCount": index % 12,
+        "updatedAt": "2024-01-01T10:00:00Z",
+        "reviewDecision": "REVIEW_REQUIRED",
+    }
+
+
+def bench_get_pr_activities(size):
+    """Aggregation of `size` organization pull requests"""
+    from github_org_activities_stats import get_pr_activities
+
+    org_pulls_data = {
+        f"repo{repo}": {
+            str(index): _get_org_pull(index)
+            for index in range(repo, size, 10)
+        }
+        for repo in range(10)
+    }
+    return lambda: get_pr_activities(org_pulls_data)
+
+
+def bench_get_event_data(size):
+    """Matching of member event to `size` pull request activities"""
+    import github_org_activities_stats as stats
+
+    org_pulls_data = {
+        f"repo{repo}": {
+            str(index): _get_org_pull(index)
+            for index in range(repo, size, 10)
+        }
+        for repo in range(10)
+    }
+    activity_data = stats.get_pr_activities(org_pulls_data)
+    # worst case, pull request is not in the activities
+    event = {
+        "type": "PullRequestReviewEvent",
+        "created_at": "2024-01-01T10:00:00Z",
+        "repo": {"name": "stub/repo9"},
+        "payload": {
+            "pull_request": {
+                "number": size + 1,
+                "user": {"login": "user1"},
+                "html_url": "https://github.com/stub/repo9/pull/1",
+            },
+            "review": {"html_url": "https://github.com/stub/repo9/pull/1"},
+        }
+    }
+    return lambda: stats.get_event_data("user2", event, activity_data)
+
+
+def _get_pyproject(dependencies):
+    lines = [
+        "[tool.poetry]",
+        'name = "ayon-core"',
+        'version = "1.0.0"  # bumped by ci-tools',
+        'description = "Synthetic pyproject"',
+        'authors = ["Ynput Team <team@ynput.io>"]',
+        "",
+        "[tool.poetry.dependencies]",
+        'python = ">=3.9.1,<3.10"',
+    ]
+    for index in range(dependencies):
+        if index % 3:
+            lines.append(f'package-{index} = "^{index % 9}.{index % 7}"')
+        else:
+            lines.append(
+                f'package-{index} = {{ version = "^1.{index}", '
+                f'extras = ["extra"], optional = true }}'
+            )
+    lines.extend([
+        "",
+        "[tool.poetry.dev-dependencies]",
+        'pytest = "^7.0"',
+        "",
+        "[build-system]",
+        'requires = ["poetry-core>=1.0.0"]',
+        'build-backend = "poetry.core.masonry.api"',
+    ])
+    return "\n".join(lines) + "\n"
+
+
+def bench_pyproject_version_span(size):
+    """In place version edit of pyproject with `size` dependencies"""
+    from versioning import set_poetry_version_span
+
+    text = _get_pyproject(size)
+    return lambda: set_poetry_version_span(text, "1.2.3")
+
+
+def bench_pyproject_version_tomlkit(size):
+    """Tomlkit version edit of pyproject with `size` dependencies"""
+    from versioning import set_poetry_version_tomlkit
+
+    text = _get_pyproject(size)
+    return lambda: set_poetry_version_tomlkit(text, "1.2.3")
+
+
+def bench_milestone_description(size):
+    """Metadata lookup in milestone description with `size` changelog lines"""
+    from milestones import (
+        MilestoneDescription,
+        MILESTONE_DESC_TAG,
+        MILESTONE_DESC_COMMIT
+    )
+
+    description = MilestoneDescription()
+    description.set(MILESTONE_DESC_COMMIT, "9a4a138b05097e9f8c71053ce74c")
+    description.set(MILESTONE_DESC_TAG, "3.2.1")
+    description.append("".join(
+        f"- Fixed something in host {index} [#{index}](url)\n"
+        for index in range(size)
+    ))
+    text = description.render()
+    return lambda: MilestoneDescription(text).get(MILESTONE_DESC_TAG)
+
+
+ISSUES_REQUIRES = ["dotenv", "requests", "aiohttp", "sklearn"]
+ORG_STATS_REQUIRES = ["dotenv", "requests", "aiohttp", "pandas", "pytz"]
+
+# name: (benchmark factory, required modules)
+BENCHMARKS = {
+    "get_body": (bench_get_body, ["mistune", "requests"]),
+    "flatten_markdown_paragraph": (
+        bench_flatten_markdown_paragraph, ["mistune", "requests"]),
+    "populate_sections": (bench_populate_sections, ["mistune", "requests"]),
+    "sort_by_hosts": (bench_sort_by_hosts, ["mistune", "requests"]),
+    "filter_versions": (bench_filter_versions, []),
+    "select_python_version": (bench_select_python_version, []),
+    "pyproject_version_span": (
+        bench_pyproject_version_span, ["semver", "tomlkit", "requests"]),
+    "pyproject_version_tomlkit": (
+        bench_pyproject_version_tomlkit, ["semver", "tomlkit", "requests"]),
+    "milestone_description": (
+        bench_milestone_description, ["requests"]),
+    "truncate_issue_body": (bench_truncate_issue_body, ISSUES_REQUIRES),
+    "get_custom_fields_from_labels": (
+        bench_get_custom_fields_from_labels, ISSUES_REQUIRES),
+    "get_pr_activities": (bench_get_pr_activities, ORG_STATS_REQUIRES),
+    "get_event_data": (bench_get_event_data, ORG_STATS_REQUIRES),
+}
+
+
+def get_missing_modules(modules):
+    return [
+        name for name in modules
+        if importlib.util.find_spec(name) is None
+    ]
+
+
+def measure(func, repeat):
+    """Get best seconds per call of function and of reference workload
+
+    Rounds of the function and of `reference_workload` alternate, so both
+    best times come from the same state of the machine.
+
+    Args:
+        func (Callable): function without arguments
+        repeat (int): amount of measured rounds
+
+    Returns:
+        tuple[float, float]: seconds per call of function and of reference
+    """
+    timers = [timeit.Timer(func), timeit.Timer(reference_workload)]
+    # calibrate amount of calls so one round takes at least 0.2s
+    numbers = [timer.autorange()[0] for timer in timers]
+    best = [math.inf, math.inf]
+    for _ in range(repeat):
+        for index, timer in enumerate(timers):
+            best[index] = min(
+                best[index], timer.timeit(numbers[index]) / numbers[index])
+    return best[0], best[1]
+
+
+def reference_workload():
+    """Fixed workload of string, dict and sorting operations
+
+    Mix of operations the measured functions spend their time in, its
+    time is the unit benchmark results are expressed in.
+    """
+    items = [f"host: item{index % 97} {index}" for index in range(2000)]
+    counts = {}
+    for item in items:
+        key = item.split()[1]
+        counts[key] = counts.get(key, 0) + 1
+    return sorted(items, key=lambda item: (counts[item.split()[1]], item))
+
+
+def get_scaling(previous, current):
+    """Get scaling exponent between two measurements
+
+    Args:
+        previous (tuple[int, float]): size and seconds
+        current (tuple[int, float]): size and seconds
+
+    Returns:
+        float: exponent, 1.0 for linear scaling
+    """
+    (size_a, time_a), (size_b, time_b) = previous, current
+    if size_a == size_b or not time_a:
+        return 0.0
+    return math.log(time_b / time_a) / math.log(size_b / size_a)
+
+
+@click.command()
+@click.option(
+    "--benchmark", "benchmarks", multiple=True,
+    type=click.Choice(list(BENCHMARKS)),
+    help="Run only selected benchmarks"
+)
+@click.option(
+    "--size", "sizes", multiple=True, type=click.INT,
+    default=[10, 100, 1000], show_default=True,
+    help="Input sizes"
+)
+@click.option(
+    "--repeat", default=5, show_default=True, type=click.INT,
+    help="Measured rounds per size, best is reported"
+)
+@click.option(
+    "--baseline", "baseline_path", default=DEFAULT_BASELINE,
+    show_default=True, type=click.Path(),
+    help="Baseline json file"
+)
+@click.option(
+    "--update-baseline", is_flag=True, default=False,
+    help="Store results of this run into baseline"
+)
+@click.option(
+    "--threshold", default=1.5, show_default=True, type=click.FLOAT,
+    help="Allowed growth of time relative to reference against baseline"
+)
+@click.option(
+    "--json", "as_json", is_flag=True, default=False,
+    help="Print results as json"
+)
+def main(
+    benchmarks, sizes, repeat, baseline_path, update_baseline, threshold,
+    as_json
+):
+    _set_printer_context()
+    benchmarks = benchmarks or list(BENCHMARKS)
+    sizes = sorted(set(sizes))
+
+    results = {}
+    skipped = []
+    for name in benchmarks:
+        factory, requires = BENCHMARKS[name]
+        missing = get_missing_modules(requires)
+        if missing:
+            skipped.append(name)
+            if not as_json:
+                print(f"{name:<32} skipped (missing {missing})")
+            continue
+
+        previous = None
+        for size in sizes:
+            # scripts are printing a lot, keep it out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, reference = measure(factory(size), repeat)
+            scaling = get_scaling(previous, (size, seconds)) \
+                if previous else None
+            previous = (size, seconds)
+            results[f"{name}@{size}"] = seconds / reference
+            if not as_json:
+                scaling_str = f"{scaling:6.2f}" if scaling is not None \
+                    else "     -"
+                print(
+                    f"{name:<32} {size:>7}  {seconds * 1e6:14.2f} us"
+                    f"  x{seconds / reference:10.3f} ref"
+                    f"  scaling {scaling_str}"
+                )
+
+    if as_json:
+        print(json.dumps(results, indent=4))
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+
+    if update_baseline:
+        baseline.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline updated: {baseline_path}", file=sys.stderr)
+        return
+
+    # benchmarks which are not compared must not pass unnoticed
+    for key in results:
+        if key not in baseline:
+            print(f"WARNING {key}: missing in baseline, not gated",
+                  file=sys.stderr)
+    for name in skipped:
+        if any(key.split("@")[0] == name for key in baseline):
+            print(f"WARNING {name}: in baseline but skipped, not gated",
+                  file=sys.stderr)
+
+    regressions = [
+        f"{key}: x{baseline[key]:.3f} -> x{ratio:.3f} of reference "
+        f"(x{ratio / baseline[key]:.2f} > x{threshold})"
+        for key, ratio in results.items()
+        if baseline.get(key) and ratio > baseline[key] * threshold
+    ]
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,780 @@
+"""
+Local stand-in for Github and ClickUp APIs.
+
+Serves either synthetic data (N pull requests, M tags, K ClickUp tasks...)
+or replays a cassette recorded with `CI_TOOLS_CASSETTE`. Latency and rate
+limiting (429 with `Retry-After`) can be emulated, every request is counted
+so benchmarks can report API calls and transferred bytes.
+
+Github REST and GraphQL are served from root, ClickUp from `/api/v2`:
+    GITHUB_API_URL=http://127.0.0.1:8080
+    CLICKUP_API_URL=http://127.0.0.1:8080/api/v2
+
+Usage:
+    python benchmarks/stub_server.py --prs 1000 --tags 500 --tasks 200
+    python benchmarks/stub_server.py --cassette release.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from collections import defaultdict, deque
+import click
+from aiohttp import web
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), "tools")
+)
+from cassette import Cassette, get_interaction_key  # noqa: E402
+
+HOSTS = ["maya", "nuke", "houdini", "blender", "resolve", "photoshop"]
+TYPES = ["feature", "enhancement", "bug", "refactor", "documentation"]
+
+PR_BODY_TEMPLATE = """## Brief description
+Short description of change {number} with `code` and **strong** text.
+
+## Description
+Longer description of pull request {number}.
+- first item
+- second _item_
+
+## Additional info
+Not part of changelog.
+"""
+
+ISSUE_BODY_TEMPLATE = """### Current Behavior:
+Issue {number} is broken.
+
+### Expected Behavior:
+It should work.
+
+### Steps To Reproduce:
+1. open
+2. click
+
+### Additional context:
+_No response_
+"""
+
+
+def _sha(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SyntheticData:
+    """In-memory state of synthetic Github and ClickUp
+
+    Args:
+        prs (int): pull requests in milestone and repository
+        tags (int): release tags (half as many CI tags are added)
+        tasks (int): ClickUp tasks
+        issues (int): open issues
+        repos (int): organization repositories
+        branches (int): feature branches next to `develop` and `main`
+        milestone (str): title of milestone holding all pull requests
+    """
+
+    def __init__(
+        self, prs=100, tags=100, tasks=100, issues=100, repos=5,
+        branches=20, milestone="next-patch"
+    ):
+        self.pulls = [self._make_pull(i + 1) for i in range(prs)]
+        self.tags = self._make_tags(tags)
+        self.branches = ["develop", "main"] + [
+            f"feature/AY-{i}_branch" for i in range(branches)]
+        self.milestones = {
+            1: {
+                "number": 1,
+                "title": milestone,
+                "description": "",
+                "state": "open",
+            }
+        }
+        self.issues = [self._make_issue(i + 1) for i in range(issues)]
+        self.tasks = {
+            f"task{i}": self._make_task(i) for i in range(tasks)}
+        self.repos = {
+            f"repo-{r}": [
+                self._make_org_pull(r, i + 1)
+                for i in range(max(1, prs // max(repos, 1)))
+            ]
+            for r in range(repos)
+        }
+        self.members = [f"user{i}" for i in range(10)]
+
+    def _make_pull(self, number):
+        labels = [
+            f"type: {TYPES[number % len(TYPES)]}",
+            f"host: {HOSTS[number % len(HOSTS)]}",
+        ]
+        prefix = "AY" if number % 2 else "OP"
+        head_ref = (
+            f"feature/{prefix}-{number}_change" if number % 5
+            else f"bugfix/change_{number}"
+        )
+        return {
+            "title": f"Change number {number}",
+            "body": PR_BODY_TEMPLATE.format(number=number),
+            "state": "MERGED",
+            "url": f"https://github.com/stub/stub/pull/{number}",
+            "number": number,
+            "headRefName": head_ref,
+            "labels": {
+                "nodes": [
+                    {"name": name, "color": "ffffff"} for name in labels
+                ]
+            },
+        }
+
+    def _make_tags(self, count):
+        tags = []
+        for i in range(count, 0, -1):
+            version = f"3.{i // 100}.{i % 100}"
+            tags.append(version)
+            if i % 2 == 0:
+                tags.append(f"CI/{version}-nightly.{i}")
+        return tags
+
+    def _make_issue(self, number):
+        labels = [
+            f"type: {TYPES[number % len(TYPES)]}",
+            f"host: {HOSTS[number % len(HOSTS)]}",
+        ]
+        return {
+            "number": number,
+            "title": f"Issue number {number}",
+            "body": ISSUE_BODY_TEMPLATE.format(number=number),
+            "url": f"https://github.com/stub/stub/issues/{number}",
+            "labels": {
+                "edges": [{"node": {"name": name}} for name in labels]
+            },
+        }
+
+    def _make_task(self, index):
+        return {
+            "id": f"task{index}",
+            "custom_id": f"AY-{index}",
+            "name": f"Task number {index}",
+            "url": f"https://app.clickup.com/t/task{index}",
+            "description": "",
+            "status": {"status": "Open"},
+            "custom_fields": [
+                {
+                    "id": "type-field",
+                    "type_config": {
+                        "options": [
+                            {"name": name, "orderindex": idx}
+                            for idx, name in enumerate(TYPES)
+                        ]
+                    }
+                },
+                {
+                    "id": "host-field",
+                    "type_config": {
+                        "options": [
+                            {"name": name, "orderindex": idx}
+                            for idx, name in enumerate(HOSTS)
+                        ]
+                    }
+                },
+            ],
+        }
+
+    def _make_org_pull(self, repo_index, number):
+        user = f"user{number % 10}"
+
+        def edges(key, values):
+            return {"edges": [{"node": {key: v}} for v in values]}
+
+        return {
+            "state": "OPEN",
+            "mergeable": "MERGEABLE",
+            "number": number,
+            "title": f"Org change {repo_index}-{number}",
+            "createdAt": "2023-10-01T10:00:00Z",
+            "lastEditedAt": None,
+            "url": f"https://github.com/stub/repo-{repo_index}/pull/{number}",
+            "headRefName": f"feature/AY-{number}_org",
+            "isDraft": False,
+            "author": {"login": user},
+            "labels": edges("name", ["type: bug"]),
+            "assignees": edges("login", [user]),
+            "reviews": {"edges": [
+                {"node": {"author": {"login": "user1"}, "state": "APPROVED"}}
+            ]},
+            "reviewDecision": "APPROVED",
+            "participants": edges("login", [user, "user1"]),
+            "reviewRequests": {"edges": []},
+            "authorAssociation": "MEMBER",
+            "changedFiles": number % 17,
+            "isCrossRepository": False,
+            "maintainerCanModify": True,
+            "totalCommentsCount": number % 5,
+            "updatedAt": "2023-10-02T10:00:00Z",
+        }
+
+    def get_events(self, login):
+        events = []
+        for idx, (repo, pulls) in enumerate(self.repos.items()):
+            pull = pulls[idx % len(pulls)]
+            events.append({
+                "id": _sha(f"{login}{repo}")[:10],
+                "type": "PullRequestReviewEvent",
+                "created_at": "2023-10-02T10:00:00Z",
+                "repo": {"name": f"stub/{repo}"},
+                "payload": {
+                    "review": {"html_url": pull["url"] + "#review"},
+                    "pull_request": {
+                        "number": pull["number"],
+                        "html_url": pull["url"],
+                        "user": {"login": pull["author"]["login"]},
+                    },
+                },
+            })
+        return events
+
+
+def _page(items, first, after):
+    start = int(after) if after else 0
+    end = start + first
+    return items[start:end], {
+        "hasNextPage": end < len(items),
+        "endCursor": str(end),
+    }
+
+
+class GraphQLResolver:
+    """Very small resolver dispatching by query content"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def resolve(self, query, variables):
+        rate_limit = {"cost": 1, "remaining": 4999, "resetAt": None}
+        if "organization" in query:
+            data = {"organization": self._organization(query, variables)}
+        elif "ref(qualifiedName" in query:
+            data = {"repository": self._branch_refs(query, variables)}
+        elif "refs(" in query:
+            data = {"repository": {"refs": self._refs(variables)}}
+        elif "issue(number" in query:
+            data = {"repository": {"issue": self._issue(variables)}}
+        elif "issues(" in query:
+            data = {"repository": {"issues": self._issues(variables)}}
+        elif "milestone(number" in query:
+            data = {"repository": {"milestone": self._milestone(variables)}}
+        elif "milestones(" in query:
+            data = {"repository": {"milestones": self._milestones(
+                variables)}}
+        else:
+            return {"data": None, "errors": [
+                {"message": "Query not supported by stub server"}]}
+
+        data["rateLimit"] = rate_limit
+        return {"data": data}
+
+    def _branch_refs(self, query, variables):
+        refs = {}
+        for alias, variable in re.findall(
+            r"(\w+): ref\(qualifiedName: \$(\w+)\)", query
+        ):
+            name = variables.get(variable, "")
+            name = name[len("refs/heads/"):]
+            refs[alias] = None
+            if name in self.data.branches:
+                refs[alias] = {"target": {"oid": _sha(name)}}
+        return refs
+
+    def _refs(self, variables):
+        # synthetic tags are already ordered newest first
+        prefix = variables.get("prefix", "refs/tags/")
+        prefix = prefix[len("refs/tags/"):]
+        names = [
+            tag[len(prefix):] for tag in self.data.tags
+            if tag.startswith(prefix)
+        ]
+        items, page_info = _page(
+            names, variables.get("first", 100), variables.get("cursor"))
+        return {
+            "pageInfo": page_info,
+            "nodes": [{"name": name} for name in items],
+        }
+
+    def _milestone_node(self, milestone):
+        node = dict(milestone)
+        node["url"] = (
+            f"https://github.com/stub/stub/milestone/{node['number']}")
+        node["pullRequests"] = {"nodes": self.data.pulls}
+        return node
+
+    def _milestone(self, variables):
+        milestone = self.data.milestones.get(variables.get("number"))
+        return self._milestone_node(milestone) if milestone else None
+
+    def _milestones(self, variables):
+        if "milestone" not in variables:
+            # listing of all milestones
+            items, page_info = _page(
+                list(self.data.milestones.values()),
+                variables.get("first", 100), variables.get("cursor")
+            )
+            return {
+                "pageInfo": page_info,
+                "nodes": [
+                    {"title": m["title"], "number": m["number"]}
+                    for m in items
+                ],
+            }
+
+        search = variables.get("milestone") or ""
+        nodes = [
+            self._milestone_node(milestone)
+            for milestone in self.data.milestones.values()
+            if search in milestone["title"]
+        ]
+        return {"nodes": nodes[:1]}
+
+    def _issues(self, variables):
+        items, page_info = _page(
+            self.data.issues,
+            variables.get("max_count", 100),
+            variables.get("after_cursor")
+        )
+        return {
+            "edges": [
+                {"node": issue, "cursor": str(issue["number"])}
+                for issue in items
+            ],
+            "pageInfo": page_info,
+        }
+
+    def _issue(self, variables):
+        number = variables.get("issue_number")
+        return next(
+            (i for i in self.data.issues if i["number"] == number), None)
+
+    def _organization(self, query, variables):
+        if "team(" in query:
+            return {"team": {"members": {"nodes": [
+                {"login": login} for login in self.data.members
+            ]}}}
+
+        if "repositories(" in query:
+            names = list(self.data.repos)
+            items, page_info = _page(names, 100, variables.get("cursor"))
+            return {"repositories": {
+                "pageInfo": page_info,
+                "edges": [{"node": {
+                    "name": name,
+                    "isArchived": False,
+                    "isFork": False,
+                    "isLocked": False,
+                    "isTemplate": False,
+                    "pullRequests": {
+                        "totalCount": len(self.data.repos[name])},
+                }} for name in items],
+            }}
+
+        pulls = self.data.repos.get(variables.get("repoName"), [])
+        items, page_info = _page(pulls, 20, variables.get("cursor"))
+        return {"repository": {"pullRequests": {
+            "pageInfo": page_info,
+            "edges": [{"node": pull} for pull in items],
+        }}}
+
+
+class StubServer:
+    """Stand-in server running aiohttp app in background thread
+
+    Args:
+        data (Optional[SyntheticData]): synthetic state
+        latency (Optional[float]): seconds added to every response
+        rate_limit (Optional[int]): requests allowed per window
+        rate_window (Optional[float]): rate limit window in seconds
+        cassette (Optional[str]): path to cassette to replay
+    """
+
+    def __init__(
+        self, data=None, latency=0.0, rate_limit=None, rate_window=60.0,
+        cassette=None
+    ):
+        self.data = data or SyntheticData()
+        self.resolver = GraphQLResolver(self.data)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.replay = self._load_cassette(cassette) if cassette else None
+
+        self.stats = {"requests": 0, "bytes": 0, "rate_limited": 0}
+        self.routes = defaultdict(int)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+        self.base_url = None
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    def _load_cassette(self, path):
+        replay = defaultdict(deque)
+        for item in Cassette.load(path).interactions:
+            key = get_interaction_key(
+                item["method"], item["url"], item["request_body"])
+            replay[key].append(item)
+        return replay
+
+    # ---------------- middlewares ----------------
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path == "/_stats":
+            return await handler(request)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.rate_limit:
+            now = time.monotonic()
+            if now - self._window_start >= self.rate_window:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                self.stats["rate_limited"] += 1
+                retry_after = int(
+                    self.rate_window - (now - self._window_start)) + 1
+                return web.json_response(
+                    {"err": "Rate limit reached", "ECODE": "APP_002"},
+                    status=429,
+                    headers={
+                        "Retry-After": str(retry_after),
+                        "X-RateLimit-Remaining": "0",
+                    }
+                )
+
+        if self.replay is not None:
+            response = await self._replay(request)
+        else:
+            response = await handler(request)
+
+        self.stats["requests"] += 1
+        self.routes[f"{request.method} {request.path}"] += 1
+        if response.body is not None:
+            self.stats["bytes"] += len(response.body)
+        return response
+
+    async def _replay(self, request):
+        body = await request.text()
+        key = get_interaction_key(
+            request.method, str(request.rel_url), body or None)
+        queue = self.replay.get(key)
+        if not queue:
+            return web.json_response(
+                {"message": f"No recorded interaction for '{key}'"},
+                status=404
+            )
+        item = queue.popleft() if len(queue) > 1 else queue[0]
+        headers = {
+            k: v for k, v in item["headers"].items()
+            if k.lower() not in (
+                "content-length", "content-encoding", "transfer-encoding")
+        }
+        return web.Response(
+            status=item["status"], text=item["body"] or "", headers=headers)
+
+    # ---------------- helpers ----------------
+    def _json(self, request, payload, status=200, headers=None):
+        text = json.dumps(payload)
+        etag = f'"{_sha(text)}"'
+        headers = dict(headers or {})
+        headers["ETag"] = etag
+        if (
+            request.method == "GET"
+            and request.headers.get("If-None-Match") == etag
+        ):
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            status=status, text=text,
+            content_type="application/json", headers=headers
+        )
+
+    def _api_url(self, request):
+        return f"{request.scheme}://{request.host}"
+
+    def _paginate(self, request, items):
+        per_page = int(request.query.get("per_page", 30))
+        page = int(request.query.get("page", 1))
+        start = (page - 1) * per_page
+        chunk = items[start:start + per_page]
+        headers = {}
+        if start + per_page < len(items):
+            headers["Link"] = (
+                f'<{self._api_url(request)}{request.path}'
+                f'?per_page={per_page}&page={page + 1}>; rel="next"'
+            )
+        return chunk, headers
+
+    def _repo_json(self, request):
+        owner = request.match_info["owner"]
+        repo = request.match_info["repo"]
+        api = self._api_url(request)
+        return {
+            "id": 1,
+            "name": repo,
+            "full_name": f"{owner}/{repo}",
+            "owner": {"login": owner},
+            "url": f"{api}/repos/{owner}/{repo}",
+            "default_branch": "develop",
+        }
+
+    def _commit_json(self, request, sha):
+        api = self._api_url(request)
+        repo = self._repo_json(request)["full_name"]
+        return {"sha": sha, "url": f"{api}/repos/{repo}/commits/{sha}"}
+
+    def _milestone_json(self, request, milestone):
+        api = self._api_url(request)
+        repo = self._repo_json(request)["full_name"]
+        return dict(
+            milestone,
+            url=f"{api}/repos/{repo}/milestones/{milestone['number']}"
+        )
+
+    # ---------------- Github ----------------
+    async def graphql(self, request):
+        payload = await request.json()
+        return self._json(request, self.resolver.resolve(
+            payload["query"], payload.get("variables") or {}))
+
+    async def get_repo(self, request):
+        return self._json(request, self._repo_json(request))
+
+    async def get_tags(self, request):
+        chunk, headers = self._paginate(request, self.data.tags)
+        return self._json(request, [
+            {
+                "name": name,
+                "commit": self._commit_json(request, _sha(name)),
+            }
+            for name in chunk
+        ], headers=headers)
+
+    async def get_branches(self, request):
+        chunk, headers = self._paginate(request, self.data.branches)
+        return self._json(request, [
+            {
+                "name": name,
+                "commit": self._commit_json(request, _sha(name)),
+                "protected": False,
+            }
+            for name in chunk
+        ], headers=headers)
+
+    async def get_branch(self, request):
+        name = request.match_info["branch"]
+        if name not in self.data.branches:
+            return self._json(request, {"message": "Not Found"}, 404)
+        return self._json(request, {
+            "name": name,
+            "commit": self._commit_json(request, _sha(name)),
+            "protected": False,
+        })
+
+    async def get_commit(self, request):
+        return self._json(
+            request, self._commit_json(request, request.match_info["sha"]))
+
+    async def milestone(self, request):
+        number = int(request.match_info["number"])
+        milestone = self.data.milestones.get(number)
+        if not milestone:
+            return self._json(request, {"message": "Not Found"}, 404)
+        if request.method == "PATCH":
+            payload = await request.json()
+            for key in ("title", "description", "state", "due_on"):
+                if key in payload:
+                    milestone[key] = payload[key]
+        return self._json(request, self._milestone_json(request, milestone))
+
+    async def patch_issue(self, request):
+        number = int(request.match_info["number"])
+        payload = json.loads(await request.text() or "{}")
+        issue = next(
+            (i for i in self.data.issues if i["number"] == number),
+            {"number": number}
+        )
+        issue.update(payload)
+        return self._json(request, issue)
+
+    async def user_events(self, request):
+        return self._json(
+            request, self.data.get_events(request.match_info["login"]))
+
+    # ---------------- ClickUp ----------------
+    async def cu_folder_lists(self, request):
+        return self._json(request, {"lists": [
+            {"id": "list0", "name": "Stub list"}
+        ]})
+
+    async def cu_list_tasks(self, request):
+        if request.method == "POST":
+            payload = await request.json()
+            index = len(self.data.tasks)
+            task = self.data._make_task(index)
+            task["name"] = payload.get("name", task["name"])
+            task["description"] = payload.get("markdown_description", "")
+            self.data.tasks[task["id"]] = task
+            return self._json(request, task)
+
+        page = int(request.query.get("page", 0))
+        tasks = list(self.data.tasks.values())
+        return self._json(request, {
+            "tasks": tasks[page * 100:(page + 1) * 100]})
+
+    def _find_task(self, task_id):
+        task = self.data.tasks.get(task_id)
+        if task:
+            return task
+        return next(
+            (t for t in self.data.tasks.values()
+             if t["custom_id"] == task_id),
+            None
+        )
+
+    async def cu_task(self, request):
+        task = self._find_task(request.match_info["task_id"])
+        if not task:
+            return self._json(
+                request, {"err": "Task not found, deleted"}, 404)
+        if request.method == "PUT":
+            payload = await request.json()
+            if "markdown_description" in payload:
+                task["description"] = payload["markdown_description"]
+        return self._json(request, task)
+
+    async def cu_task_field(self, request):
+        task = self._find_task(request.match_info["task_id"])
+        if not task:
+            return self._json(
+                request, {"err": "Task not found, deleted"}, 404)
+        return self._json(request, {})
+
+    async def get_stats(self, request):
+        return web.json_response(dict(self.stats, routes=self.routes))
+
+    # ---------------- server ----------------
+    def make_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        repo = "/repos/{owner}/{repo}"
+        app.router.add_get("/_stats", self.get_stats)
+        app.router.add_post("/graphql", self.graphql)
+        app.router.add_get(repo, self.get_repo)
+        app.router.add_get(f"{repo}/tags", self.get_tags)
+        app.router.add_get(f"{repo}/branches", self.get_branches)
+        app.router.add_get(f"{repo}/branches/{{branch:.+}}", self.get_branch)
+        app.router.add_get(f"{repo}/commits/{{sha}}", self.get_commit)
+        app.router.add_route(
+            "*", f"{repo}/milestones/{{number}}", self.milestone)
+        app.router.add_patch(f"{repo}/issues/{{number}}", self.patch_issue)
+        app.router.add_get("/users/{login}/events/public", self.user_events)
+        app.router.add_get(
+            "/api/v2/folder/{folder_id}/list", self.cu_folder_lists)
+        app.router.add_route(
+            "*", "/api/v2/list/{list_id}/task", self.cu_list_tasks)
+        app.router.add_route("*", "/api/v2/task/{task_id}", self.cu_task)
+        app.router.add_post(
+            "/api/v2/task/{task_id}/field/{field_id}", self.cu_task_field)
+        return app
+
+    def reset_stats(self):
+        self.stats.update({"requests": 0, "bytes": 0, "rate_limited": 0})
+        self.routes.clear()
+
+    def start(self, host="127.0.0.1", port=0):
+        """Start server in background thread
+
+        Returns:
+            str: base url of server
+        """
+        started = threading.Event()
+
+        def _run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.make_app())
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, host, port)
+            self._loop.run_until_complete(site.start())
+            bound_port = site._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://{host}:{bound_port}"
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop(self):
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(
+            self._runner.cleanup(), self._loop)
+        future.result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8080, show_default=True, type=click.INT)
+@click.option("--prs", default=100, show_default=True, type=click.INT)
+@click.option("--tags", default=100, show_default=True, type=click.INT)
+@click.option("--tasks", default=100, show_default=True, type=click.INT)
+@click.option("--issues", default=100, show_default=True, type=click.INT)
+@click.option("--repos", default=5, show_default=True, type=click.INT)
+@click.option("--branches", default=20, show_default=True, type=click.INT)
+@click.option(
+    "--milestone", default="next-patch", show_default=True,
+    help="Title of milestone holding all pull requests"
+)
+@click.option(
+    "--latency-ms", default=0.0, show_default=True, type=click.FLOAT,
+    help="Latency added to every response"
+)
+@click.option(
+    "--rate-limit", default=None, type=click.INT,
+    help="Requests allowed per window, 429 is returned above"
+)
+@click.option(
+    "--rate-window", default=60.0, show_default=True, type=click.FLOAT,
+    help="Rate limit window in seconds"
+)
+@click.option(
+    "--cassette", default=None, type=click.Path(exists=True),
+    help="Replay recorded cassette instead of synthetic data"
+)
+def main(
+    host, port, prs, tags, tasks, issues, repos, branches, milestone,
+    latency_ms, rate_limit, rate_window, cassette
+):
+    server = StubServer(
+        SyntheticData(
+            prs=prs, tags=tags, tasks=tasks, issues=issues, repos=repos,
+            branches=branches, milestone=milestone
+        ),
+        latency=latency_ms / 1000,
+        rate_limit=rate_limit,
+        rate_window=rate_window,
+        cassette=cassette
+    )
+    web.run_app(server.make_app(), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,9 @@ load_dotenv()
 
 JSON_ISSUES_FILE_PATH = "temp_file_issues.json"
 JSON_TASKS_FILE_PATH = "temp_file_cu_tasks.json"
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+CLICKUP_API_URL = os.getenv(
+    "CLICKUP_API_URL", "https://api.clickup.com/api/v2")
 
 
 class CTX:
@@ -100,7 +103,7 @@ async def _get_github_issue_data(session, issue_number):
     headers = {'Authorization': f'Bearer {access_token}'}
 
     async with session.post(
-        "https://api.github.com/graphql",
+        f"{GITHUB_API_URL}/graphql",
         json={'query': single_issue_query, "variables": variables},
         headers=headers,
     ) as response:
@@ -199,7 +202,7 @@ def _get_issues_from_repository(from_issue_number=None, to_issue_number=None):
         # Send the GraphQL query to the GitHub API
         headers = {'Authorization': f'Bearer {access_token}'}
         response = requests.post(
-            'https://api.github.com/graphql',
+            f'{GITHUB_API_URL}/graphql',
             json={'query': query, "variables": variables},
             headers=headers
         )
@@ -328,7 +331,7 @@ async def _get_clickup_task(
     }
 
     url = (
-        f"https://api.clickup.com/api/v2/task/{cu_id_hash}")
+        f"{CLICKUP_API_URL}/task/{cu_id_hash}")
 
     response = await _get_clickup_request(session, url, query)
 
@@ -372,7 +375,7 @@ async def _get_one_each_clickup_tasks(
         }
 
         url = (
-            f"https://api.clickup.com/api/v2/list/{list_id}/task")
+            f"{CLICKUP_API_URL}/list/{list_id}/task")
 
         response = await _get_clickup_request(session, url, query)
 
@@ -416,7 +419,7 @@ async def _get_all_clickup_tasks(
         }
 
         url = (
-            f"https://api.clickup.com/api/v2/list/{list_id}/task")
+            f"{CLICKUP_API_URL}/list/{list_id}/task")
 
         response = await _get_clickup_request(session, url, query)
 
@@ -516,7 +519,7 @@ async def _make_clickup_task(
     }
 
     url = (
-        f"https://api.clickup.com/api/v2/list/{CTX.list_id}/task")
+        f"{CLICKUP_API_URL}/list/{CTX.list_id}/task")
 
     response = await _post_clickup_request(session, url, payload, query)
 
@@ -539,7 +542,7 @@ async def _update_clickup_task(
     }
 
     url = (
-        f"https://api.clickup.com/api/v2/task/{cu_task_id}")
+        f"{CLICKUP_API_URL}/task/{cu_task_id}")
 
     response = await _put_clickup_request(session, url, payload, query)
 
@@ -618,7 +621,7 @@ async def _update_cuid_url_to_issue(session, issue, task_data, cu_id_tag=None):
 
     # update github issue with new body
     url = (
-        f"https://api.github.com/repos/{CTX.repo_owner}/{CTX.repo_name}"
+        f"{GITHUB_API_URL}/repos/{CTX.repo_owner}/{CTX.repo_name}"
         f"/issues/{issue['number']}"
     )
 
@@ -633,7 +636,7 @@ async def _close_github_issue(session, issue):
     """Close issue in Github."""
     print(f"Closing Issue: {issue['number']}")
     url = (
-        f"https://api.github.com/repos/{CTX.repo_owner}/{CTX.repo_name}"
+        f"{GITHUB_API_URL}/repos/{CTX.repo_owner}/{CTX.repo_name}"
         f"/issues/{issue['number']}"
     )
 
@@ -696,7 +699,7 @@ def _get_clickup_task_data_by_cu_id(cu_id_custom=None, cu_id=None):
 async def _get_clickup_folder_list_ids(session, folder_id):
     """Get all lists ids from clickup folder."""
     url = (
-        f"https://api.clickup.com/api/v2/folder/{folder_id}/list")
+        f"{CLICKUP_API_URL}/folder/{folder_id}/list")
 
     response = await _get_clickup_request(session, url, {"archived": "false"})
 
@@ -24,6 +24,7 @@ import pytz
 import datetime
 import json
 import os
+import tempfile
 from pprint import pprint
 from dotenv import load_dotenv
 import pandas as pd
@@ -36,6 +37,7 @@ load_dotenv()
 
 JSON_FILE_USERS = os.path.join(os.path.dirname(__file__), "data_users.json")
 JSON_FILE_REPOS = os.path.join(os.path.dirname(__file__), "data_repos.json")
+JSON_FILE_ETAGS = os.path.join(os.path.dirname(__file__), "data_etags.json")
 USER_CSV_FILE = os.path.join(os.path.dirname(__file__), "user_activities.csv")
 PR_CSV_FILE = os.path.join(os.path.dirname(__file__), "pr_activities.csv")
 
@@ -47,6 +49,7 @@ HEADERS = {
 # Get the organization name from the user
 ORG_NAME = os.getenv('GITHUB_ORGANIZATION')
 TEAM_NAME = os.getenv('GITHUB_TEAM')
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 
 def get_current_time():
@@ -184,7 +187,7 @@ async def get_all_pulls(cached=False):
         while has_next_page:
             # Send the GraphQL request
             async with session.post(
-                "https://api.github.com/graphql",
+                f"{GITHUB_API_URL}/graphql",
                 json={"query": query_repos, "variables": variables},
                 headers=HEADERS
             ) as response:
@@ -269,7 +272,7 @@ async def _get_pull_data_from_repo(query_pulls, data_repos, session, repo):
         # Send the GraphQL request
 
         async with session.post(
-            "https://api.github.com/graphql",
+            f"{GITHUB_API_URL}/graphql",
             json={"query": query_pulls, "variables": variables},
             headers=HEADERS
         ) as response:
@@ -300,6 +303,60 @@ async def _get_pull_data_from_repo(query_pulls, data_repos, session, repo):
                 page_index += 1
 
 
+def load_etag_cache():
+    if not os.path.exists(JSON_FILE_ETAGS):
+        return {}
+    try:
+        with open(JSON_FILE_ETAGS) as json_file:
+            return json.load(json_file)
+    except ValueError:
+        return {}
+
+
+def save_etag_cache(etag_cache):
+    # write to unique file and swap it so concurrent runs never
+    # read half written cache
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(JSON_FILE_ETAGS), suffix=".tmp")
+    with os.fdopen(fd, "w") as outfile:
+        json.dump(etag_cache, outfile)
+    os.replace(tmp_path, JSON_FILE_ETAGS)
+
+
+def get_conditionally(url, etag_cache, used_cache):
+    """GET json revalidated with ETag stored by previous run
+
+    Github answers `304 Not Modified` when data did not change, such
+    answer is not counted to rate limit and body is taken from cache.
+    Entries are keyed by url and hash of token, only entries used by
+    current run are kept (`used_cache`) so cache does not grow over time.
+
+    Args:
+        url (str): REST url
+        etag_cache (dict): entries stored by previous run
+        used_cache (dict): entries of current run to be stored
+
+    Returns:
+        Any: decoded json body
+    """
+    key = f"{sha1(HEADERS['Authorization'].encode()).hexdigest()} {url}"
+    headers = dict(HEADERS)
+    entry = etag_cache.get(key)
+    if entry:
+        headers["If-None-Match"] = entry["etag"]
+
+    response = requests.get(url, headers=headers)
+    if response.status_code == 304 and entry:
+        used_cache[key] = entry
+        return entry["body"]
+
+    body = response.json()
+    etag = response.headers.get("ETag")
+    if response.status_code == 200 and etag:
+        used_cache[key] = {"etag": etag, "body": body}
+    return body
+
+
 def get_all_members_activity_data(cached=False):
 
     if os.path.exists(JSON_FILE_USERS) and cached:
@@ -330,7 +387,7 @@ def get_all_members_activity_data(cached=False):
 
         # Send the GraphQL request
         response_users = requests.post(
-            "https://api.github.com/graphql",
+            f"{GITHUB_API_URL}/graphql",
             json={"query": query_users, "variables": variables},
             headers=HEADERS
         )
@@ -347,17 +404,23 @@ def get_all_members_activity_data(cached=False):
         print(members)
 
         events_activity = {}
+        etag_cache = load_etag_cache()
+        used_cache = {}
         # Iterate over all the teams in the organization
         for member in members:
             login = member["login"]
             # exclude bot user
             if login == "ynbot":
                 continue
-            events_response = requests.get(f'https://api.github.com/users/{login}/events/public', headers=HEADERS)
-            events = events_response.json()
+            events = get_conditionally(
+                f'{GITHUB_API_URL}/users/{login}/events/public',
+                etag_cache,
+                used_cache
+            )
             events_activity[login] = {
                 "events": events
             }
+        save_etag_cache(used_cache)
 
         # save all captured data to json file for further analysis
         with open(JSON_FILE_USERS, 'w') as outfile:
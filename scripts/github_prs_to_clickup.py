@@ -19,6 +19,10 @@ headers = {
 
 json_file_path = "temp_file_prs.json"
 
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+CLICKUP_API_URL = os.getenv(
+    "CLICKUP_API_URL", "https://api.clickup.com/api/v2")
+
 
 def get_pulls_from_repository(from_pr_number, to_pr_number):
     """Get a list of pull requests from the repository."""
@@ -89,7 +93,7 @@ def get_pulls_from_repository(from_pr_number, to_pr_number):
         # Send the GraphQL query to the GitHub API
         headers = {'Authorization': f'Bearer {access_token}'}
         response = requests.post(
-            'https://api.github.com/graphql',
+            f'{GITHUB_API_URL}/graphql',
             json={'query': query, "variables": variables},
             headers=headers
         )
@@ -169,7 +173,7 @@ async def set_release_names_to_clickup(
     }
 
     url = (
-        f"https://api.clickup.com/api/v2/task/{clickup_custom_id}"
+        f"{CLICKUP_API_URL}/task/{clickup_custom_id}"
         f"/field/{field_id}"
     )
     print(url)
@@ -192,7 +196,7 @@ async def get_release(pull, session):
 
     # Get pull request details
     pr_url = (
-        f"https://api.github.com/repos/{repo_owner}/"
+        f"{GITHUB_API_URL}/repos/{repo_owner}/"
         f"{repo_name}/pulls/{pr_number}"
     )
     pr_response = await get_request_to_session(session, pr_url)
@@ -206,7 +210,7 @@ async def get_release(pull, session):
 
     # Get the details of the merge commit
     commit_url = (
-        f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+        f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}"
         f"/commits/{merge_commit_url}"
     )
     commit_response = await get_request_to_session(session, commit_url)
@@ -219,7 +223,7 @@ async def get_release(pull, session):
 
     # Get all the tags associated with the repository
     release_url = (
-        f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
+        f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/releases"
     )
     release_response = await get_request_to_session(session, release_url)
 
@@ -0,0 +1,170 @@
+"""
+Recording of http interactions into cassette file.
+
+When `CI_TOOLS_CASSETTE` is set, every request made through `requests`
+and `aiohttp` is captured together with its response and written as json
+into the cassette file at exit. Cassettes are replayed
+by the local stand-in server `benchmarks/stub_server.py`, so commands can be
+benchmarked and regression tested without network.
+
+Authorization headers are never written into cassette.
+"""
+import json
+import atexit
+import threading
+from urllib.parse import urlsplit
+from utils import Printer
+
+printer = Printer(__name__)
+
+REDACTED_HEADERS = ("authorization", "cookie", "set-cookie")
+
+# cassette being recorded, wrappers of http clients are installed once
+_cassette = None
+
+
+def _decode_body(body):
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
+
+
+def _clean_headers(headers):
+    return {
+        key: value for key, value in dict(headers).items()
+        if key.lower() not in REDACTED_HEADERS
+    }
+
+
+def get_interaction_key(method, url, body=None):
+    """Get key matching recorded interaction to incoming request
+
+    Host is ignored so cassette can be replayed from any server.
+
+    Args:
+        method (str): http method
+        url (str): absolute or relative url
+        body (Optional[str]): request body
+
+    Returns:
+        str: key
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.query:
+        path += f"?{parts.query}"
+    return f"{method.upper()} {path} {body or ''}"
+
+
+class Cassette:
+    """Collection of recorded interactions
+
+    Args:
+        path (str): path to cassette json file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+
+    def record(
+        self, method, url, request_body, status, headers, body
+    ):
+        with self._lock:
+            self.interactions.append({
+                "method": method.upper(),
+                "url": url,
+                "request_body": _decode_body(request_body),
+                "status": status,
+                "headers": _clean_headers(headers),
+                "body": _decode_body(body)
+            })
+
+    def save(self):
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.interactions, f, indent=4)
+        printer.debug(
+            "Recorded %s interactions to '%s'",
+            len(self.interactions), self.path
+        )
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            cassette.interactions = json.load(f)
+        return cassette
+
+
+def _save_cassette():
+    if _cassette is not None:
+        _cassette.save()
+
+
+def install_recorder(path):
+    """Record all `requests` and `aiohttp` traffic into cassette
+
+    Http clients are wrapped only on first call. Next calls (daemon runs
+    `cli` callback for every forwarded command) keep recording into the
+    same cassette, or save it and switch to new one when path differs.
+
+    Args:
+        path (str): path to cassette json file
+
+    Returns:
+        Cassette: cassette being recorded
+    """
+    global _cassette
+
+    if _cassette is not None:
+        if _cassette.path != path:
+            _cassette.save()
+            _cassette = Cassette(path)
+        return _cassette
+
+    from requests.adapters import HTTPAdapter
+
+    _cassette = Cassette(path)
+
+    original_send = HTTPAdapter.send
+
+    def send(self, request, **kwargs):
+        response = original_send(self, request, **kwargs)
+        _cassette.record(
+            request.method, request.url, request.body,
+            response.status_code, response.headers, response.content
+        )
+        return response
+
+    HTTPAdapter.send = send
+
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+
+    if aiohttp is not None:
+        original_request = aiohttp.ClientSession._request
+
+        async def _request(self, method, str_or_url, **kwargs):
+            response = await original_request(
+                self, method, str_or_url, **kwargs)
+            # body is cached by response so callers can read it again
+            body = await response.read()
+            request_body = kwargs.get("data")
+            if kwargs.get("json") is not None:
+                request_body = json.dumps(kwargs["json"])
+            _cassette.record(
+                method, str(response.url), request_body,
+                response.status, response.headers, body
+            )
+            return response
+
+        aiohttp.ClientSession._request = _request
+
+    atexit.register(_save_cassette)
+    return _cassette
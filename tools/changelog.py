@@ -16,16 +16,20 @@
 
 from copy import deepcopy
 import re
+import functools
 import requests
 import click
 import tempfile
 import mistune
 import itertools
 from pprint import pformat
-from repository import GithubConnect
-from utils import Printer
+from repository import get_repo_context
+from milestones import fetch_milestone
+from utils import Printer, LazyFormat
 
-printer = Printer()
+printer = Printer(__name__)
+
+RENDERED_BODIES_CACHE_SIZE = 4096
 
 
 class PullRequestDescription:
@@ -125,6 +129,14 @@ class PullRequestDescription:
         return self.title
 
     def get_body(self) -> dict:
+        return self._render_body(self.body)
+
+    # rendering is cached by body text so warm processes (daemon mode)
+    # do not parse the same markdown again, size is bounded as the
+    # daemon renders bodies of many milestones
+    @classmethod
+    @functools.lru_cache(maxsize=RENDERED_BODIES_CACHE_SIZE)
+    def _render_body(cls, body) -> dict:
         processing_headers = {}
         headers = [
             "Brief description",
@@ -132,7 +144,7 @@ class PullRequestDescription:
             "Changelog Description"
         ]
         markdown = mistune.create_markdown(renderer="ast")
-        markdown_obj = markdown(self.body)
+        markdown_obj = markdown(body)
 
         # check if any of the headers are available
         test_available_headers = [
@@ -143,7 +155,7 @@ class PullRequestDescription:
             )
         ]
         if not test_available_headers:
-            return self.body
+            return body
 
         # first get all defined headers and its paragraphs
         actual_header = None
@@ -172,7 +184,7 @@ class PullRequestDescription:
                 processing_headers[actual_header].append(el_)
 
         parsed_body = {
-            header: self._flatten_markdown_paragraph(paragraph)
+            header: cls._flatten_markdown_paragraph(paragraph)
             for header, paragraph in processing_headers.items()
         }
 
@@ -201,7 +213,8 @@ class PullRequestDescription:
         return text
 
 
-    def _flatten_markdown_paragraph(self, input, type_=None):
+    @classmethod
+    def _flatten_markdown_paragraph(cls, input, type_=None):
         if isinstance(input, dict):
             type_ = type_ or input.get("type")
 
@@ -209,7 +222,7 @@ class PullRequestDescription:
         if isinstance(input, list):
             nested_list = list(
                 itertools.chain(*[
-                    self._flatten_markdown_paragraph(item, type_)
+                    cls._flatten_markdown_paragraph(item, type_)
                     for item in input
                 ])
             )
@@ -220,7 +233,7 @@ class PullRequestDescription:
                 # some reformats are applied to list of inputs
                 nested_list = list(
                     itertools.chain(*[
-                        self._flatten_markdown_paragraph(item, input.get("type"))
+                        cls._flatten_markdown_paragraph(item, input.get("type"))
                         for item in input["children"]
                     ])
                 )
@@ -228,7 +241,7 @@ class PullRequestDescription:
                 # other reformats are applied directly
                 nested_list = list(
                     itertools.chain(*[
-                        self._flatten_markdown_paragraph(item, item.get("type"))
+                        cls._flatten_markdown_paragraph(item, item.get("type"))
                         for item in input["children"]
                     ])
                 )
@@ -302,8 +315,6 @@ class DomaineItems:
 
 
 class ChangeLogMilestoneProcessor:
-    repo_connect = GithubConnect()
-
     domain_color = "#367F6C"
     domain_bold = False
     domain_cursive = True
@@ -337,43 +348,58 @@ class ChangeLogMilestoneProcessor:
 
     query = """
             query (
-                $owner: String!, $repo_name: String!, $milestone: String!
+                $owner: String!, $repo_name: String!, $number: Int!
             ){
                 repository(owner: $owner, name: $repo_name) {
-                    milestones(query: $milestone, first: 1) {
-                        nodes{
-                            title
-                            url
-                            number
-                            pullRequests(states:[OPEN, MERGED], first: 1000){
-                                nodes{
-                                    title
-                                    body
-                                    state
-                                    url
-                                    number
-                                    labels(first: 100){
-                                        nodes{
-                                            name
-                                            color
-                                        }
+                    milestone(number: $number) {
+                        title
+                        url
+                        number
+                        pullRequests(states:[OPEN, MERGED], first: 1000){
+                            nodes{
+                                title
+                                body
+                                state
+                                url
+                                number
+                                labels(first: 100){
+                                    nodes{
+                                        name
+                                        color
                                     }
                                 }
                             }
                         }
                     }
                 }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
             }
         """
 
     _pullrequests: list[PullRequestDescription] = []
 
-    def __init__(self, milestone) -> None:
+    def __init__(self, milestone, context=None) -> None:
+        self.repo_connect = get_repo_context(context)
+        # instance containers so repeated runs in one process
+        # (daemon mode) do not accumulate pulls
+        self._pullrequests = []
+        self.sections = [
+            SectionItems(section.title, section.label)
+            for section in type(self).sections
+        ]
+
         # Execute the query
-        result = self._run_github_query(milestone)
+        milestone_data = self._run_github_query(milestone)
+        if not milestone_data:
+            raise NameError(
+                f"Input milestone does not exists: '{milestone}'"
+                f" repo: '{self.repo_connect.repo_path}'"
+            )
 
-        # Drill down the dictionary
-        milestone_data = result["data"]['repository']['milestones']['nodes'].pop()
         pullrequest_data = milestone_data.pop("pullRequests")
         assert pullrequest_data, "Missing PullRequest in Milestone"
 
@@ -381,8 +407,9 @@ class ChangeLogMilestoneProcessor:
             pull = PullRequestDescription(**pr_)
             self._pullrequests.append(pull)
 
-        printer.echo(f"Amount or Collected PRs {len(self._pullrequests)}")
-        printer.echo(f"Collected PRs {pformat(self._pullrequests)}")
+        printer.debug("Amount or Collected PRs %s", len(self._pullrequests))
+        printer.debug(
+            "Collected PRs %s", LazyFormat(pformat, self._pullrequests))
 
         self._populate_sections()
         self._sort_by_hosts()
@@ -393,43 +420,17 @@ class ChangeLogMilestoneProcessor:
         Args:
             milestone (str): milestone name
 
-        Raises:
-            Exception: _description_
-
         Returns:
-            str: json text
+            dict: milestone data, None if milestone does not exist
         """
-        variables = {
-            "owner": self.repo_connect.owner,
-            "repo_name": self.repo_connect.name,
-            "milestone": milestone
-        }
-
-        try:
-            # A simple function to use requests.post to make
-            # the API call. Note the json= section.
-            request = requests.post(
-                'https://api.github.com/graphql',
-                json={'query': self.query, "variables": variables},
-                headers=_get_request_header(),
-                timeout=3
-            )
-            request.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            raise requests.exceptions.RequestException(f"Request error: {err}")
-        except requests.exceptions.HTTPError as errh:
-            raise requests.exceptions.HTTPError(f"Http Error: {errh}")
-        except requests.exceptions.ConnectionError as errc:
-            raise requests.exceptions.ConnectionError(f"Error Connecting: {errc}")
-        except requests.exceptions.Timeout as errt:
-            raise requests.exceptions.Timeout(f"Timeout Error: {errt}")
-
-        return request.json()
+        return fetch_milestone(
+            milestone, self.query, self.repo_connect, expected_nodes=1000)
 
     def _populate_sections(self):
         all_labels = [sec.label for sec in self.sections if "*" not in sec.label]
         for pull in self._pullrequests:
-            printer.echo(f"Pull {pull.number}:'{pull.title}' / {pull.types}")
+            printer.debug(
+                "Pull %s:'%s' / %s", pull.number, pull.title, pull.types)
             for section in self.sections:
                 if section.label != "*" and any(re.match(section.label, type_) for type_ in pull.types):
                     section.pull_append(pull)
@@ -553,26 +554,27 @@ ___
         return out_text
 
 
-def _get_request_header():
-    repo_connect = GithubConnect()
+def _get_request_header(context=None):
+    repo_connect = get_repo_context(context)
 
     return {"Authorization": f"Bearer {repo_connect.token}"}
 
 
-def assign_milestone_to_issue(milestone_id, issue_id):
+def assign_milestone_to_issue(milestone_id, issue_id, context=None):
     """Assign milestone to issue by ids
 
     Args:
         milestone_id (int): milestone number id
         issue_id (int): issue milestone id
+        context (Optional[RepositoryContext]): repository connection
     """
-    repo_connect = GithubConnect()
+    repo_connect = get_repo_context(context)
 
     try:
         request = requests.patch(
-            url=f"https://api.github.com/repos/{repo_connect.repo_path}/issues/{issue_id}",
+            url=f"{repo_connect.api_url}/repos/{repo_connect.repo_path}/issues/{issue_id}",
             data=f"{{\"milestone\": {milestone_id}}}",
-            headers=_get_request_header(),
+            headers=_get_request_header(repo_connect),
             timeout=3
         )
         request.raise_for_status()
@@ -612,26 +614,42 @@ def assign_milestone_to_issue_cli(milestone_id, issue_id):
         milestone_id (int): milestone number id
         issue_id (int): issue milestone id
     """
-    printer.echo("Assigning milestone to issue by ids...")
+    printer.debug("Assigning milestone to issue by ids...")
     assign_milestone_to_issue(milestone_id, issue_id)
 
 
-def generate_milestone_changelog(milestone, new_tag, old_tag):
-    """Generate changelog from input milestone
+def get_changelog_release_head(old_tag, new_tag, context=None):
+    """Get changelog head with link to full changes between tags
 
     Args:
-        milestone (str): milestone name
-        new_tag (str):  New version tag
         old_tag (str):  Current version tag
+        new_tag (str):  New version tag
+        context (Optional[RepositoryContext]): repository connection
+
+    Returns:
+        str: markdown text
     """
-    repo_connect = GithubConnect()
+    repo_connect = get_repo_context(context)
 
-    release_head = f"""
+    return f"""
 [Full Changelog](https://github.com/{repo_connect.repo_path}/compare/{old_tag}...{new_tag})
 
 """
 
-    changelog = ChangeLogMilestoneProcessor(milestone)
+
+def generate_milestone_changelog(milestone, new_tag, old_tag, context=None):
+    """Generate changelog from input milestone
+
+    Args:
+        milestone (str): milestone name
+        new_tag (str):  New version tag
+        old_tag (str):  Current version tag
+        context (Optional[RepositoryContext]): repository connection
+    """
+    context = get_repo_context(context)
+    release_head = get_changelog_release_head(old_tag, new_tag, context)
+
+    changelog = ChangeLogMilestoneProcessor(milestone, context)
 
     # join head with changelog
     changelog_str = release_head + changelog.generate()
@@ -639,6 +657,25 @@ def generate_milestone_changelog(milestone, new_tag, old_tag):
     return changelog_str
 
 
+def write_changelog_temp_file(changelog_str):
+    """Write changelog text to temp file
+
+    Args:
+        changelog_str (str): changelog markdown text
+
+    Returns:
+        str: path to temp file
+    """
+    tfile = tempfile.NamedTemporaryFile(mode="w+", encoding="UTF-8")
+    tfile.close()
+
+    with open(tfile.name, mode="w+", encoding="UTF-8") as file:
+        file.write(changelog_str)
+        file.close()
+
+    return tfile.name
+
+
 @click.command(
     name="generate-milestone-changelog",
     help=(
@@ -668,21 +705,16 @@ def generate_milestone_changelog_cli(milestone, new_tag, old_tag):
         new_tag (str):  New version tag
         old_tag (str):  Current version tag
     """
-    printer.echo("Generating changelog from milestone...")
+    printer.debug("Generating changelog from milestone...")
 
     changelong_str = generate_milestone_changelog(milestone, new_tag, old_tag)
 
-    tfile = tempfile.NamedTemporaryFile(mode="w+", encoding="UTF-8")
-    tfile.close()
-
-    with open(tfile.name, mode="w+", encoding="UTF-8") as file:
-        file.write(changelong_str)
-        file.close()
-
-    print(tfile.name)
+    print(write_changelog_temp_file(changelong_str))
 
 
-def add_to_changelog(new_changelog_path, old_changelog_path, tag):
+def add_to_changelog(
+    new_changelog_path, old_changelog_path, tag, context=None
+):
     """Add new changelog to current changelog file
 
     Args:
@@ -690,9 +722,10 @@ def add_to_changelog(new_changelog_path, old_changelog_path, tag):
         old_changelog_path (str): Path to current changelog
                                   file usually `./CHANGELOG.md`
         tag (str): New tag version
+        context (Optional[RepositoryContext]): repository connection
     """
-    printer.echo("Adding changelog to changelog file...")
-    repo_connect = GithubConnect()
+    printer.debug("Adding changelog to changelog file...")
+    repo_connect = get_repo_context(context)
 
     release_head = f"""
 ## [{tag}](https://github.com/{repo_connect.repo_path}/tree/{tag})
@@ -1,93 +1,106 @@
 import os
+import sys
 import click
 from dotenv import load_dotenv
-from utils import Printer
-
-
-from changelog import (
-    generate_milestone_changelog_cli,
-    assign_milestone_to_issue_cli,
-    add_to_changelog_cli
-)
-from environment import set_pyenv_python_version
-from milestones import (
-    get_commit_from_milestone_description_cli,
-    get_tag_from_milestone_description_cli,
-    set_commit_to_milestone_description_cli,
-    set_tag_to_milestone_description_cli,
-    set_changelog_to_milestone_description_cli,
-    set_new_milestone_title_cli
-)
-from versioning import (
-    bump_version_cli,
-    current_version_cli,
-    bump_file_versions_cli
-)
-from repository import (
-    GithubConnect,
-    get_latest_commit_cli
-)
-from project_management import (
-    milestone_prs_to_clickup_cli
-)
+from utils import Printer, LazyGroup, parse_log_levels
+from repository import GithubConnect
 
 load_dotenv()
 
-printer = Printer()
+printer = Printer(__name__)
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "generate-milestone-changelog":
+            "changelog.generate_milestone_changelog_cli",
+        "set-milestone-to-issue": "changelog.assign_milestone_to_issue_cli",
+        "add-to-changelog-file": "changelog.add_to_changelog_cli",
+    }
+)
 def changelog():
-    printer.echo("Changelog commands activated...")
+    printer.debug("Changelog commands activated...")
 
-changelog.add_command(generate_milestone_changelog_cli)
-changelog.add_command(assign_milestone_to_issue_cli)
-changelog.add_command(add_to_changelog_cli)
 
-
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "prs-to-clickup": "project_management.milestone_prs_to_clickup_cli",
+    }
+)
 def project():
-    printer.echo("Project commands activated...")
+    printer.debug("Project commands activated...")
 
-project.add_command(milestone_prs_to_clickup_cli)
 
-
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "set-python-version": "environment.set_pyenv_python_version",
+    }
+)
 def env():
-    printer.echo("Environment commands activated...")
+    printer.debug("Environment commands activated...")
 
-env.add_command(set_pyenv_python_version)
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "get-latest-commit": "repository.get_latest_commit_cli",
+    }
+)
 def repo():
-    printer.echo("repository commands activated...")
-
-repo.add_command(get_latest_commit_cli)
-
-
-@click.group()
+    printer.debug("repository commands activated...")
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "get-milestone-commit":
+            "milestones.get_commit_from_milestone_description_cli",
+        "get-milestone-tag":
+            "milestones.get_tag_from_milestone_description_cli",
+        "set-milestone-commit":
+            "milestones.set_commit_to_milestone_description_cli",
+        "set-milestone-tag":
+            "milestones.set_tag_to_milestone_description_cli",
+        "set-milestone-changelog":
+            "milestones.set_changelog_to_milestone_description_cli",
+        "set-milestone-title": "milestones.set_new_milestone_title_cli",
+        "update": "milestones.update_milestone_cli",
+    }
+)
 def milestones():
-    printer.echo("milestones commands activated...")
-
-milestones.add_command(get_commit_from_milestone_description_cli)
-milestones.add_command(get_tag_from_milestone_description_cli)
-milestones.add_command(set_commit_to_milestone_description_cli)
-milestones.add_command(set_tag_to_milestone_description_cli)
-milestones.add_command(set_changelog_to_milestone_description_cli)
-milestones.add_command(set_new_milestone_title_cli)
+    printer.debug("milestones commands activated...")
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "bump-version": "versioning.bump_version_cli",
+        "current-version": "versioning.current_version_cli",
+        "bump-file-version": "versioning.bump_file_versions_cli",
+    }
+)
 def versioning():
-    printer.echo("Versioning commands activated...")
-
-versioning.add_command(bump_version_cli)
-versioning.add_command(current_version_cli)
-versioning.add_command(bump_file_versions_cli)
+    printer.debug("Versioning commands activated...")
 
 
 @click.group()
 @click.option("--debug/--no-debug", default=False)
+@click.option(
+    "--log-level", "log_levels", multiple=True,
+    help=(
+        "Log level `debug|info|warning|error` of all modules or "
+        "`module=level` of one module, e.g. `changelog=debug`. "
+        "Defaults to `CI_TOOLS_LOG_LEVEL` (comma separated)"
+    )
+)
+@click.option(
+    "--log-format", type=click.Choice(["text", "json"]),
+    envvar="CI_TOOLS_LOG_FORMAT", default="text", show_default=True,
+    help="Json lines are meant for CI log processing"
+)
 @click.option(
     "--repo-owner", required=False,
     help="Repo organization or owner",
@@ -101,29 +114,108 @@ versioning.add_command(bump_file_versions_cli)
     help="Github Token"
 )
 @click.pass_context
-def cli(ctx, debug, github_token=None, repo_owner=None, repo_name=None):
+def cli(
+    ctx, debug, log_levels=(), log_format="text", github_token=None,
+    repo_owner=None, repo_name=None
+):
     # ensure that ctx.obj exists and is a dict (in case `cli()` is called
     # by means other than the `if` block below)
     ctx.ensure_object(dict)
 
     ctx.obj["DEBUG"] = debug
+    log_level, module_levels = parse_log_levels(
+        log_levels or [os.getenv("CI_TOOLS_LOG_LEVEL", "")])
+    ctx.obj["LOG_LEVEL"] = log_level
+    ctx.obj["LOG_MODULE_LEVELS"] = module_levels
+    ctx.obj["LOG_FORMAT"] = log_format
     ctx.obj["CLICKUP_API_KEY"] = os.getenv("CLICKUP_API_KEY")
     ctx.obj["CLICKUP_RELEASE_FIELD_ID"] = os.getenv("CLICKUP_RELEASE_FIELD_ID")
     ctx.obj["CLICKUP_TEAM_ID"] = os.getenv("CLICKUP_TEAM_ID")
+    ctx.obj["CLICKUP_API_URL"] = os.getenv(
+        "CLICKUP_API_URL", "https://api.clickup.com/api/v2")
     Printer.set_context(ctx)
 
+    cassette_path = os.getenv("CI_TOOLS_CASSETTE")
+    if cassette_path:
+        from cassette import install_recorder
+        install_recorder(cassette_path)
+
     github_token = github_token or os.getenv("GITHUB_TOKEN")
     repo_owner = repo_owner or os.getenv("GITHUB_REPOSITORY_OWNER")
     repo_name = repo_name or os.getenv("GITHUB_REPOSITORY_NAME")
-    # connect to repo
-    GithubConnect.set_attributes(repo_owner, repo_name, github_token)
+    # register repo connection (resolved lazily on first use)
+    GithubConnect.set_attributes(
+        repo_owner, repo_name, github_token,
+        api_url=os.getenv("GITHUB_API_URL")
+    )
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "run": "release.release_run_cli",
+    }
+)
+def release():
+    printer.debug("Release commands activated...")
+
 
+@click.command(
+    name="serve",
+    help=(
+        "Run warm daemon serving forwarded cli commands over unix socket. "
+        "Clients forward commands when `CI_TOOLS_DAEMON_SOCKET` is set."
+    )
+)
+@click.option(
+    "--socket", "socket_path", required=False,
+    help="Socket path (default: `CI_TOOLS_DAEMON_SOCKET`)"
+)
+@click.option(
+    "--idle-timeout", required=False, type=click.FLOAT,
+    help="Stop daemon after seconds without any request"
+)
+@click.option(
+    "--stop", is_flag=True, default=False,
+    help="Stop running daemon"
+)
+@click.pass_context
+def serve(ctx, socket_path=None, idle_timeout=None, stop=False):
+    import daemon
+
+    socket_path = socket_path or os.getenv("CI_TOOLS_DAEMON_SOCKET")
+    if not socket_path:
+        raise click.UsageError("Missing socket path")
+
+    if stop:
+        daemon.stop_daemon(socket_path)
+        return
+
+    printer.debug("Serving at '%s'..", socket_path)
+    daemon.serve(ctx.find_root().command, socket_path, idle_timeout)
+
+
+cli.add_command(serve)
 cli.add_command(changelog)
 cli.add_command(project)
 cli.add_command(env)
 cli.add_command(repo)
 cli.add_command(versioning)
 cli.add_command(milestones)
+cli.add_command(release)
 
 if __name__ == '__main__':
+    daemon_socket = os.getenv("CI_TOOLS_DAEMON_SOCKET")
+    if "serve" not in sys.argv[1:] and daemon_socket:
+        import daemon
+
+        if daemon.is_daemon_available(daemon_socket):
+            try:
+                exit_code = daemon.run_client(daemon_socket, sys.argv[1:])
+            except (ConnectionRefusedError, FileNotFoundError):
+                # socket file left behind by killed daemon, run locally
+                pass
+            else:
+                sys.exit(exit_code)
+
     cli()
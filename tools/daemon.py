@@ -0,0 +1,216 @@
+"""
+Warm daemon mode of `cli.py`.
+
+`cli.py serve --socket PATH` keeps one process alive with imported modules,
+the Github connection, the GraphQL session and in-process caches. A thin
+client forwards its argv, working directory and relevant environment over
+a Unix socket and streams back stdout, stderr and the exit code.
+
+Client is used automatically by `cli.py` when `CI_TOOLS_DAEMON_SOCKET`
+points to a running daemon.
+
+Protocol is newline delimited json:
+    request:  {"argv": [...], "cwd": "...", "env": {...}}
+              {"shutdown": true}
+    response: {"stream": "stdout" | "stderr", "data": "..."} (repeated)
+              {"exit_code": 0}
+"""
+import os
+import sys
+import json
+import socket
+import traceback
+import contextlib
+
+FORWARDED_ENV_PREFIXES = ("GITHUB_", "CLICKUP_", "CI_TOOLS_")
+
+
+class _FrameWriter:
+    """File-like object sending every write as a frame to client"""
+    encoding = "utf-8"
+
+    def __init__(self, conn, stream):
+        self._conn = conn
+        self._stream = stream
+
+    def write(self, data):
+        if isinstance(data, bytes):
+            data = data.decode(self.encoding, errors="replace")
+        if data:
+            _send_frame(self._conn, {"stream": self._stream, "data": data})
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def _send_frame(conn, frame):
+    conn.sendall(json.dumps(frame).encode("utf-8") + b"\n")
+
+
+def _iter_frames(conn):
+    with conn.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _check_unix_socket():
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Daemon mode requires Unix socket support")
+
+
+def run_client(socket_path, argv):
+    """Forward command to running daemon
+
+    Args:
+        socket_path (str): path to daemon socket
+        argv (list[str]): cli arguments
+
+    Returns:
+        int: exit code of the command
+    """
+    _check_unix_socket()
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {
+            key: value for key, value in os.environ.items()
+            if key.startswith(FORWARDED_ENV_PREFIXES)
+        }
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        _send_frame(conn, request)
+        conn.shutdown(socket.SHUT_WR)
+        for frame in _iter_frames(conn):
+            if "exit_code" in frame:
+                return frame["exit_code"]
+            stream = sys.stderr if frame["stream"] == "stderr" else sys.stdout
+            stream.write(frame["data"])
+            stream.flush()
+
+    # daemon closed connection without exit code
+    return 1
+
+
+def stop_daemon(socket_path):
+    _check_unix_socket()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        _send_frame(conn, {"shutdown": True})
+
+
+def is_daemon_available(socket_path):
+    return bool(
+        socket_path
+        and hasattr(socket, "AF_UNIX")
+        and os.path.exists(socket_path)
+    )
+
+
+@contextlib.contextmanager
+def _request_environment(cwd, env):
+    old_cwd = os.getcwd()
+    old_env = {
+        key: value for key, value in os.environ.items()
+        if key.startswith(FORWARDED_ENV_PREFIXES)
+    }
+    for key in old_env:
+        os.environ.pop(key)
+    os.environ.update(env)
+    os.chdir(cwd)
+    try:
+        yield
+    finally:
+        os.chdir(old_cwd)
+        for key in env:
+            os.environ.pop(key, None)
+        os.environ.update(old_env)
+
+
+def _execute(root_command, argv, stdout, stderr):
+    import click
+
+    if "serve" in argv:
+        stderr.write("Nested `serve` is not allowed\n")
+        return 2
+
+    with contextlib.redirect_stdout(stdout), \
+            contextlib.redirect_stderr(stderr):
+        try:
+            root_command.main(
+                args=argv, prog_name="cli.py", standalone_mode=False)
+        except click.exceptions.Exit as exc:
+            return exc.exit_code
+        except click.ClickException as exc:
+            exc.show(file=stderr)
+            return exc.exit_code
+        except click.Abort:
+            stderr.write("Aborted!\n")
+            return 1
+        except SystemExit as exc:
+            code = exc.code
+            if code is None:
+                return 0
+            return code if isinstance(code, int) else 1
+        except Exception:
+            stderr.write(traceback.format_exc())
+            return 1
+    return 0
+
+
+def serve(root_command, socket_path, idle_timeout=None):
+    """Serve forwarded commands until shutdown or idle timeout
+
+    Commands are executed one by one in this process so module level
+    state (connection, sessions, caches) stays warm between them.
+
+    Args:
+        root_command (click.Command): root cli group
+        socket_path (str): path to socket file
+        idle_timeout (Optional[float]): seconds without request to stop
+    """
+    _check_unix_socket()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        server.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+
+                with conn:
+                    request = next(_iter_frames(conn), None)
+                    if not request:
+                        continue
+                    if request.get("shutdown"):
+                        break
+
+                    stdout = _FrameWriter(conn, "stdout")
+                    stderr = _FrameWriter(conn, "stderr")
+                    try:
+                        with _request_environment(
+                            request["cwd"], request.get("env", {})
+                        ):
+                            exit_code = _execute(
+                                root_command, request["argv"],
+                                stdout, stderr
+                            )
+                        _send_frame(conn, {"exit_code": exit_code})
+                    except OSError:
+                        # client went away
+                        continue
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
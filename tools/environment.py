@@ -1,11 +1,19 @@
+import os
 import re
 import io
+import json
+import math
+import time
+import bisect
+import shutil
+import tarfile
+import tempfile
 import click
 import subprocess
 import platform
-from utils import Printer
+from utils import Printer, write_json_file
 
-printer = Printer()
+printer = Printer(__name__)
 
 def file_regex_find(filename, regex):
     with open(filename, 'r') as f:
@@ -23,61 +31,77 @@ def check_pyproject_python_version(pyproject_path=None):
     return file_regex_find(pyproject_path, regex)
 
 
-def _install_pyenv_version(pyenv_executable, pyproj_pyversion):
-    args_versions_available = [pyenv_executable, "install", "-l"]
-    available_versions = _get_stdout_from_command(args_versions_available)
-    version_to_install = _filter_versions(available_versions, pyproj_pyversion)
+def _install_pyenv_version(
+    pyenv_executable, pyproj_pyversion, catalogue=None, refresh=False,
+    archive_dir=None
+):
+    catalogue = catalogue or PyenvCatalogue(pyenv_executable)
+    version_to_install = catalogue.find_available(
+        VersionConstraint(pyproj_pyversion), refresh)
 
     if not version_to_install:
         raise KeyError((
             "Version doesn't exists in pyenv repository. "
-            f"Available versions: {available_versions}. "
+            f"Available versions: {catalogue.available()}. "
             f"Pyproject.toml version: {pyproj_pyversion}."
         ))
 
+    archive_cache = None
+    if archive_dir:
+        archive_cache = PythonArchiveCache(archive_dir, pyenv_executable)
+
+    if archive_cache and archive_cache.restore(version_to_install):
+        catalogue.add_installed(version_to_install)
+        return version_to_install
+
     # pyenv install version
-    _subprocess_args(
-        [pyenv_executable, "install", version_to_install]
-    ).communicate()
+    proc = _subprocess_args(
+        [pyenv_executable, "install", version_to_install])
+    proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"Installing python '{version_to_install}' failed, "
+            f"pyenv exited with code {proc.returncode}"
+        )
+    catalogue.add_installed(version_to_install)
+
+    if archive_cache:
+        archive_cache.store(version_to_install)
 
     return version_to_install
 
 
 def _filter_versions(versions, test_version):
-    # in case of ">=3.9.1,<3.10"
-    if "," in test_version:
-        test_version = test_version.split(",")[-1]
-
-    # remove all symbols and keep only semver
-    test_version = re.sub("[\^<>=]", "", test_version)
-
-    # lets add .* at the and if there is not
-    # so in next step we replace it with number search
-    if "*" not in test_version:
-        test_version += ".*"
-
-    printer.echo(f"Testing version: {test_version}")
-
-    test_version = test_version.replace("*", "[\\d]+")
-    regex = f"({test_version})"
-    match_versions = []
-    for v_ in versions:
-        found = re.findall(regex, v_)
-        if not found:
-            continue
-        match_versions.append(found.pop())
-
-    printer.echo(match_versions)
-    # reverse sort so pop can take higher version
-    if match_versions:
-        match_versions = sorted(
-            list(set(match_versions))
-        )
-        return match_versions.pop()
+    """Get highest version satisfying pyproject python constraint
+
+    Args:
+        versions (list[str]): pyenv output lines
+        test_version (str): poetry constraint, e.g. `>=3.9.1,<3.10`
+
+    Returns:
+        Union[str, None]: version
+    """
+    constraint = VersionConstraint(test_version)
+    printer.debug("Testing version: %s", constraint)
+
+    # one-off lookup, linear pass is cheaper than building index
+    keys = map(
+        _get_version_key,
+        set(PYTHON_VERSION_PATTERN.findall("\n".join(versions)))
+    )
+    matching = [key for key in keys if constraint.allows(key)]
+    if matching:
+        return ".".join(map(str, max(matching)))
 
 
 def _subprocess_args(args):
-    return subprocess.Popen(args, shell=True, stdout=subprocess.PIPE)
+    # `pyenv.bat` needs shell on Windows, on other platforms shell with
+    # list of args would run only the first item
+    return subprocess.Popen(
+        args,
+        shell=platform.system().lower() == "windows",
+        stdout=subprocess.PIPE
+    )
 
 
 def _get_stdout_from_command(args):
@@ -90,6 +114,445 @@ def _get_stdout_from_command(args):
     return return_list
 
 
+# first token of pyenv output line, `* 3.9.1 (set by ...)` or `  3.9.1`
+PYTHON_VERSION_PATTERN = re.compile(
+    r"^[ \t*]*(\d+\.\d+\.\d+)(?=[ \t]|$)", re.MULTILINE)
+
+
+def _get_version_key(version):
+    return tuple(map(int, version.split(".")))
+
+
+def parse_python_versions(lines):
+    """Get CPython final release versions from pyenv output
+
+    Lines like `* 3.9.1 (set by ...)` are accepted, pre-releases and
+    other implementations (pypy, miniconda...) are skipped.
+
+    Args:
+        lines (list[str]): pyenv output lines
+
+    Returns:
+        list[str]: unique versions sorted from highest
+    """
+    versions = set(PYTHON_VERSION_PATTERN.findall("\n".join(lines)))
+    return sorted(versions, key=_get_version_key, reverse=True)
+
+
+MIN_VERSION = (0, 0, 0)
+MAX_VERSION = (math.inf, math.inf, math.inf)
+CONSTRAINT_CLAUSE_PATTERN = re.compile(
+    r"^(?P<op>\^|~=|~|>=|<=|>|<|==|!=|=)?"
+    r"(?P<version>\*|\d+(?:\.\d+){0,2}(?:\.\*)?)$"
+)
+
+
+def _pad_version(parts):
+    return tuple(parts) + (0,) * (3 - len(parts))
+
+
+def _bump_version_part(parts, index):
+    """Get lowest version above all versions sharing `parts[:index + 1]`"""
+    bumped = list(parts[:index + 1])
+    bumped[index] += 1
+    return _pad_version(bumped)
+
+
+def _next_version(version):
+    return version[:2] + (version[2] + 1,)
+
+
+def _get_clause_intervals(clause):
+    """Get intervals `[lower, upper)` of one constraint clause
+
+    Bare partial version (`3.9`) is handled as wildcard (`3.9.*`).
+
+    Args:
+        clause (str): e.g. `^3.9`, `>=3.9.1`, `3.9.*`
+
+    Returns:
+        list[tuple[tuple, tuple]]: intervals
+    """
+    match = CONSTRAINT_CLAUSE_PATTERN.match(clause)
+    if not match:
+        raise ValueError(f"Unsupported version constraint '{clause}'")
+
+    op = match.group("op") or ""
+    version = match.group("version")
+    if version == "*":
+        return [] if op == "!=" else [(MIN_VERSION, MAX_VERSION)]
+
+    wildcard = version.endswith(".*")
+    parts = [int(part) for part in version.rstrip(".*").split(".")]
+    lower = _pad_version(parts)
+
+    if wildcard or (not op and len(parts) < 3):
+        interval = (lower, _bump_version_part(parts, len(parts) - 1))
+        if op == "!=":
+            return [(MIN_VERSION, interval[0]), (interval[1], MAX_VERSION)]
+        return [interval]
+
+    if op == "^":
+        # first non-zero part is kept, or last given part for all zeros
+        index = next(
+            (i for i, part in enumerate(parts) if part), len(parts) - 1)
+        return [(lower, _bump_version_part(parts, index))]
+    if op == "~":
+        return [(lower, _bump_version_part(parts, min(len(parts) - 1, 1)))]
+    if op == "~=":
+        if len(parts) < 2:
+            raise ValueError(f"Unsupported version constraint '{clause}'")
+        return [(lower, _bump_version_part(parts, len(parts) - 2))]
+    if op == ">=":
+        return [(lower, MAX_VERSION)]
+    if op == ">":
+        return [(_next_version(lower), MAX_VERSION)]
+    if op == "<=":
+        return [(MIN_VERSION, _next_version(lower))]
+    if op == "<":
+        return [(MIN_VERSION, lower)]
+    if op == "!=":
+        return [(MIN_VERSION, lower), (_next_version(lower), MAX_VERSION)]
+    # `==`, `=` or exact version
+    return [(lower, _next_version(lower))]
+
+
+def _intersect_intervals(intervals_a, intervals_b):
+    intersected = []
+    for lower_a, upper_a in intervals_a:
+        for lower_b, upper_b in intervals_b:
+            lower = max(lower_a, lower_b)
+            upper = min(upper_a, upper_b)
+            if lower < upper:
+                intersected.append((lower, upper))
+    return intersected
+
+
+class VersionConstraint:
+    """Poetry version constraint parsed into intervals
+
+    Supports caret (`^`), tilde (`~`, `~=`), comparisons, exact and
+    wildcard (`3.9.*`) versions. Clauses separated by comma or space
+    must all match, `||` separates alternatives.
+
+    Args:
+        constraint (str): e.g. `>=3.9.1,<3.10` or `^3.9 || ~3.11`
+    """
+
+    def __init__(self, constraint):
+        self.constraint = constraint
+        self.intervals = self._parse(constraint)
+
+    def __repr__(self) -> str:
+        return f"<VersionConstraint('{self.constraint}') {self.intervals}>"
+
+    @staticmethod
+    def _parse(constraint):
+        intervals = []
+        for alternative in re.split(r"\|\|?", constraint):
+            # glue operators to versions, `>= 3.9` -> `>=3.9`
+            alternative = re.sub(
+                r"(\^|~=|~|>=|<=|>|<|==|!=|=)\s+", r"\1", alternative)
+            clauses = [
+                clause for clause in re.split(r"[,\s]+", alternative)
+                if clause
+            ]
+            if not clauses:
+                continue
+
+            alternative_intervals = [(MIN_VERSION, MAX_VERSION)]
+            for clause in clauses:
+                alternative_intervals = _intersect_intervals(
+                    alternative_intervals, _get_clause_intervals(clause))
+            intervals.extend(alternative_intervals)
+        return intervals
+
+    def allows(self, version):
+        """Check if version satisfies constraint
+
+        Args:
+            version (tuple[int, int, int]): version
+        """
+        return any(lower <= version < upper for lower, upper in self.intervals)
+
+    def select(self, index):
+        """Get highest version of index satisfying constraint
+
+        Args:
+            index (PythonVersionIndex): versions
+
+        Returns:
+            Union[str, None]: version
+        """
+        candidates = [
+            index.get_highest(lower, upper)
+            for lower, upper in self.intervals
+        ]
+        candidates = [item for item in candidates if item is not None]
+        if candidates:
+            return max(candidates)[1]
+
+
+class PythonVersionIndex:
+    """Versions sorted numerically for bisection
+
+    Args:
+        versions (list[str]): `major.minor.patch` versions
+    """
+
+    def __init__(self, versions):
+        self.versions = sorted(versions, key=_get_version_key)
+        self.keys = list(map(_get_version_key, self.versions))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get_highest(self, lower, upper):
+        """Get highest version in `[lower, upper)`
+
+        Returns:
+            Union[tuple[tuple, str], None]: version key and version
+        """
+        index = bisect.bisect_left(self.keys, upper) - 1
+        if index >= 0 and self.keys[index] >= lower:
+            return self.keys[index], self.versions[index]
+
+
+class PyenvCatalogue:
+    """Available and installed pyenv python versions
+
+    List of available versions is stored in the cache directory and
+    invalidated when pyenv version changes or when older than ttl.
+    Installed versions are asked from pyenv once per process, the call
+    is local and cached list would go stale after `pyenv uninstall`.
+
+    Args:
+        pyenv_executable (str): pyenv executable
+        path (Optional[str]): cache json file
+        ttl (Optional[float]): seconds cached lists are valid, defaults
+            to `CI_TOOLS_PYENV_CACHE_TTL` or one day
+    """
+    default_ttl = 24 * 60 * 60
+
+    def __init__(self, pyenv_executable, path=None, ttl=None):
+        from utils import get_cache_dir
+
+        self.pyenv_executable = pyenv_executable
+        self.path = path or os.path.join(
+            get_cache_dir(), "pyenv_catalogue.json")
+        if ttl is None:
+            ttl = float(
+                os.getenv("CI_TOOLS_PYENV_CACHE_TTL") or self.default_ttl)
+        self.ttl = ttl
+        self._pyenv_version = None
+        self._installed = None
+        self._indexes = {}
+        self._data = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except ValueError:
+            return {}
+
+    def _save(self):
+        write_json_file(self.path, self._data, indent=4)
+
+    @property
+    def pyenv_version(self):
+        if self._pyenv_version is None:
+            output = _get_stdout_from_command(
+                [self.pyenv_executable, "--version"])
+            self._pyenv_version = " ".join(output).strip()
+        return self._pyenv_version
+
+    def _get_versions(self, kind, args, refresh=False):
+        entry = self._data.get(kind)
+        if (
+            not refresh
+            and entry
+            and entry["pyenv_version"] == self.pyenv_version
+            and time.time() - entry["time"] < self.ttl
+        ):
+            printer.debug("Using cached pyenv '%s' versions", kind)
+            return entry["versions"]
+
+        versions = parse_python_versions(_get_stdout_from_command(args))
+        self._set_versions(kind, versions)
+        return versions
+
+    def _set_versions(self, kind, versions):
+        self._indexes.pop(kind, None)
+        self._data[kind] = {
+            "pyenv_version": self.pyenv_version,
+            "time": time.time(),
+            "versions": versions
+        }
+        self._save()
+
+    def available(self, refresh=False):
+        return self._get_versions(
+            "available", [self.pyenv_executable, "install", "-l"], refresh)
+
+    def installed(self, refresh=False):
+        if refresh or self._installed is None:
+            self._indexes.pop("installed", None)
+            self._installed = parse_python_versions(
+                _get_stdout_from_command(
+                    [self.pyenv_executable, "versions"]))
+        return self._installed
+
+    def add_installed(self, version):
+        self._indexes.pop("installed", None)
+        self._installed = parse_python_versions(self.installed() + [version])
+
+    def _get_index(self, kind, versions):
+        if kind not in self._indexes:
+            self._indexes[kind] = PythonVersionIndex(versions)
+        return self._indexes[kind]
+
+    def find_installed(self, constraint, refresh=False):
+        """Get highest installed version satisfying constraint
+
+        Args:
+            constraint (VersionConstraint): parsed constraint
+            refresh (Optional[bool]): ignore cached list
+
+        Returns:
+            Union[str, None]: version
+        """
+        versions = self.installed(refresh)
+        return constraint.select(self._get_index("installed", versions))
+
+    def find_available(self, constraint, refresh=False):
+        """Get highest installable version satisfying constraint
+
+        Args:
+            constraint (VersionConstraint): parsed constraint
+            refresh (Optional[bool]): ignore cached list
+
+        Returns:
+            Union[str, None]: version
+        """
+        versions = self.available(refresh)
+        return constraint.select(self._get_index("available", versions))
+
+
+class PythonArchiveCache:
+    """Directory of prebuilt python interpreters
+
+    Interpreters built by `pyenv install` are stored as tarballs keyed by
+    version, OS and architecture, and extracted into pyenv versions root
+    instead of building again.
+
+    Args:
+        archive_dir (str): directory with archives
+        pyenv_executable (str): pyenv executable
+    """
+
+    def __init__(self, archive_dir, pyenv_executable):
+        self.archive_dir = archive_dir
+        self.pyenv_executable = pyenv_executable
+        self._versions_root = None
+
+    @property
+    def versions_root(self):
+        if self._versions_root is None:
+            output = _get_stdout_from_command(
+                [self.pyenv_executable, "root"])
+            self._versions_root = os.path.join(
+                " ".join(output).strip(), "versions")
+        return self._versions_root
+
+    def get_archive_path(self, version):
+        system = platform.system().lower()
+        machine = platform.machine().lower()
+        return os.path.join(
+            self.archive_dir, f"cpython-{version}-{system}-{machine}.tar.gz")
+
+    def restore(self, version):
+        """Extract archived interpreter into pyenv versions root
+
+        Args:
+            version (str): python version
+
+        Returns:
+            bool: interpreter was restored
+        """
+        archive_path = self.get_archive_path(version)
+        if not os.path.exists(archive_path):
+            printer.debug("No archive '%s'", archive_path)
+            return False
+
+        target = os.path.join(self.versions_root, version)
+        os.makedirs(self.versions_root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(
+            dir=self.versions_root, prefix=f".{version}.")
+        try:
+            with tarfile.open(archive_path, "r:gz") as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(tmp_dir, filter="data")
+                else:
+                    tar.extractall(tmp_dir)
+            # archive holds single `<version>` directory
+            os.replace(os.path.join(tmp_dir, version), target)
+        except (OSError, tarfile.TarError) as err:
+            printer.warning("Restoring '%s' failed: %s", archive_path, err)
+            return False
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        _subprocess_args([self.pyenv_executable, "rehash"]).communicate()
+        printer.debug("Restored python '%s' from '%s'", version, archive_path)
+        return True
+
+    def store(self, version):
+        """Archive interpreter installed in pyenv versions root
+
+        Failures (e.g. read-only or full archive directory) are only
+        logged, installed interpreter is usable without archive.
+
+        Args:
+            version (str): python version
+
+        Returns:
+            Union[str, None]: archive path, None if version is not
+                installed or archiving failed
+        """
+        source = os.path.join(self.versions_root, version)
+        if not os.path.isdir(source):
+            printer.warning(
+                "Python '%s' is not installed, not archived", version)
+            return None
+
+        archive_path = self.get_archive_path(version)
+        tmp_path = None
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.archive_dir,
+                prefix=f"{os.path.basename(archive_path)}.",
+                suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as f:
+                with tarfile.open(fileobj=f, mode="w:gz") as tar:
+                    tar.add(source, arcname=version)
+            # mkstemp creates file readable only by owner
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, archive_path)
+        except (OSError, tarfile.TarError) as err:
+            printer.warning("Archiving '%s' failed: %s", archive_path, err)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        printer.debug("Archived python '%s' to '%s'", version, archive_path)
+        return archive_path
+
+
 @click.command(
     name="set-python-version",
     help=(
@@ -101,9 +564,23 @@ def _get_stdout_from_command(args):
     help="Relative path to project root",
     type=click.Path()
 )
-def set_pyenv_python_version(pyproject_path=None):
+@click.option(
+    "--refresh-cache", is_flag=True, default=False,
+    help="Ask pyenv for versions even if cached lists are valid"
+)
+@click.option(
+    "--archive-dir", required=False, envvar="CI_TOOLS_PYTHON_ARCHIVE_DIR",
+    type=click.Path(file_okay=False),
+    help=(
+        "Directory of prebuilt interpreter archives used instead of "
+        "building, newly built interpreters are archived there"
+    )
+)
+def set_pyenv_python_version(
+    pyproject_path=None, refresh_cache=False, archive_dir=None
+):
 
-    printer.echo("Setting up python environment...")
+    printer.debug("Setting up python environment...")
 
     pyenv_executable = "pyenv"
     pyproj_pyversion = check_pyproject_python_version(pyproject_path)
@@ -111,20 +588,26 @@ def set_pyenv_python_version(pyproject_path=None):
     if platform.system().lower() == "windows":
         pyenv_executable += ".bat"
 
-    args_versions_installed = [pyenv_executable, "versions"]
-    installed_versions = _get_stdout_from_command(args_versions_installed)
+    catalogue = PyenvCatalogue(pyenv_executable)
+    constraint = VersionConstraint(pyproj_pyversion)
+    printer.debug("Testing version: %s", constraint)
 
     # check if available versions corresponding to pyproj vers
-    exist_version = _filter_versions(installed_versions, pyproj_pyversion)
+    exist_version = catalogue.find_installed(constraint, refresh_cache)
 
     if not exist_version:
         exist_version = _install_pyenv_version(
-            pyenv_executable, pyproj_pyversion
+            pyenv_executable, pyproj_pyversion, catalogue, refresh_cache,
+            archive_dir
         )
 
     # pyenv local version to current dir
-    _subprocess_args(
-        [pyenv_executable, "local", exist_version]
-    ).communicate()
+    proc = _subprocess_args([pyenv_executable, "local", exist_version])
+    proc.communicate()
+    if proc.returncode != 0:
+        raise click.ClickException(
+            f"Setting local python '{exist_version}' failed, "
+            f"pyenv exited with code {proc.returncode}"
+        )
 
     print(exist_version)
@@ -0,0 +1,170 @@
+import re
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from repository import GithubConnect
+from utils import Printer
+
+printer = Printer(__name__)
+
+
+class GraphQLClient:
+    """Shared Github GraphQL client
+
+    Keeps one keep-alive session per process, retries transient
+    failures with jittered exponential backoff and remembers
+    the latest reported `rateLimit`.
+    """
+    _session: requests.Session = None
+    _session_lock = threading.Lock()
+    _rate_limit: dict = None
+
+    retries = 4
+    backoff_base = 0.5
+    backoff_max = 8.0
+    retry_statuses = (502, 503, 504)
+
+    # timeout scaled by amount of expected nodes in the response
+    timeout_base = 5.0
+    timeout_per_node = 0.01
+    timeout_max = 60.0
+
+    def __init__(self):
+        pass
+
+    @property
+    def session(self):
+        cls = type(self)
+        if cls._session is None:
+            # threads of `run_for_repos` may ask for session at once
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=4, pool_maxsize=16)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @property
+    def rate_limit(self):
+        """Latest `rateLimit` returned by Github
+
+        Returns:
+            dict: with `cost`, `remaining` and `resetAt` keys or None
+        """
+        return self._rate_limit
+
+    def _get_request_header(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def get_timeout(self, query, expected_nodes=None):
+        """Get request timeout scaled by expected payload
+
+        Args:
+            query (str): GraphQL query
+            expected_nodes (Optional[int]): amount of expected nodes,
+                estimated from `first:` arguments of query if not set
+
+        Returns:
+            float: timeout in seconds
+        """
+        if expected_nodes is None:
+            expected_nodes = sum(
+                int(n) for n in re.findall(r"first:\s*(\d+)", query)
+            )
+        timeout = self.timeout_base + self.timeout_per_node * expected_nodes
+        return min(timeout, self.timeout_max)
+
+    def _sleep_backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        # full jitter
+        time.sleep(random.uniform(0, delay))
+
+    def _store_rate_limit(self, data):
+        rate_limit = (data.get("data") or {}).get("rateLimit")
+        if rate_limit:
+            type(self)._rate_limit = rate_limit
+            printer.debug("Github rate limit: %s", rate_limit)
+
+    def run_query(self, query, variables, expected_nodes=None, context=None):
+        """Running query at Github
+
+        Args:
+            query (str): GraphQL query
+            variables (dict): query variables
+            expected_nodes (Optional[int]): amount of expected nodes
+            context (Optional[RepositoryContext]): repository connection,
+                registry connection is used if not set (queries not
+                bound to default repository, e.g. organization listing)
+
+        Raises:
+            requests.exceptions.RequestException: in case all retries failed
+
+        Returns:
+            dict: json data
+        """
+        if context is None:
+            api_url = GithubConnect.get_api_url()
+            token = GithubConnect.get_token()
+        else:
+            api_url, token = context.api_url, context.token
+        timeout = self.get_timeout(query, expected_nodes)
+        attempt = 0
+        while True:
+            try:
+                request = self.session.post(
+                    f"{api_url}/graphql",
+                    json={"query": query, "variables": variables},
+                    headers=self._get_request_header(token),
+                    timeout=timeout
+                )
+                if (
+                    request.status_code in self.retry_statuses
+                    and attempt < self.retries
+                ):
+                    printer.debug(
+                        "Github responded %s, retrying..",
+                        request.status_code
+                    )
+                    self._sleep_backoff(attempt)
+                    attempt += 1
+                    continue
+                request.raise_for_status()
+            except requests.exceptions.HTTPError as errh:
+                raise requests.exceptions.HTTPError(f"Http Error: {errh}")
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout
+            ) as err:
+                if attempt < self.retries:
+                    printer.debug("Request failed '%s', retrying..", err)
+                    self._sleep_backoff(attempt)
+                    attempt += 1
+                    continue
+                raise type(err)(f"Request error: {err}")
+            except requests.exceptions.RequestException as err:
+                raise requests.exceptions.RequestException(
+                    f"Request error: {err}")
+
+            data = request.json()
+            self._store_rate_limit(data)
+            return data
+
+
+def run_github_query(query, variables, expected_nodes=None, context=None):
+    """Running query at Github with shared client
+
+    Args:
+        query (str): GraphQL query
+        variables (dict): query variables
+        expected_nodes (Optional[int]): amount of expected nodes
+        context (Optional[RepositoryContext]): repository connection
+
+    Returns:
+        dict: json data
+    """
+    return GraphQLClient().run_query(
+        query, variables, expected_nodes, context)
@@ -14,141 +14,532 @@ set_milestone_name:
             - return milestone name
 """
 
+import os
+import json
 import click
+import hashlib
+import threading
+import requests
 from pprint import pprint
 from datetime import datetime
-import requests
 import re
-from utils import Printer
+from utils import Printer, LazyFormat, write_json_file
 from repository import (
-    GithubConnect
+    get_repo_context,
+    resolve_repo_paths,
+    run_for_repos,
+    print_repos_results
 )
+from graphql_client import GraphQLClient, run_github_query
 
-printer = Printer()
+printer = Printer(__name__)
 
 MILESTONE_DESC_COMMIT = "closing-commit-hash:"
 MILESTONE_DESC_TAG = "closing-tag:"
+MILESTONE_DESC_CHANGELOG = "changelog-hash:"
+
+# block is matched with any line ending, Github web UI saves CRLF
+METADATA_BLOCK_PATTERN = re.compile(
+    r"<!-- ci-tools:metadata -->(\r?\n)(.*?)"
+    r"<!-- /ci-tools:metadata -->(?:\r?\n|$)",
+    re.DOTALL
+)
+# `key: value` lines prepended to description before metadata block
+LEGACY_ELEMENT_PATTERN = re.compile(
+    r"(closing-commit-hash|closing-tag):\s([a-z0-9\.]+)[^\n]*\n?")
 
 QUERY = """
     query (
-        $repo_owner: String!, $repo_name: String!, $milestone: String!
+        $owner: String!, $repo_name: String!, $number: Int!
     ){
-        repository(owner: $repo_owner, name: $repo_name) {
-            milestones(query: $milestone, first: 1) {
-                nodes{
-                    title
-                    url
-                    number
-                    description
-                }
+        repository(owner: $owner, name: $repo_name) {
+            milestone(number: $number) {
+                title
+                url
+                number
+                description
             }
         }
+        rateLimit {
+            cost
+            remaining
+            resetAt
+        }
     }
 """
 
-def _get_request_header():
-    repo_connect = GithubConnect()
 
-    return {"Authorization": f"Bearer {repo_connect.token}"}
+class MilestoneIndex:
+    """Index of milestone numbers by title
+
+    Built from one paginated listing of all milestones and persisted
+    at `path`. Listing is repeated only when title is missing or when
+    milestone found by number has another title (renamed or deleted).
+    Index is shared by threads of concurrent commands, listing and
+    writes are serialized by lock of the index.
+
+    Args:
+        context (Optional[RepositoryContext]): repository connection
+        path (Optional[str]): json file of persisted index
+    """
+    _indexes: dict = {}
+    _lock = threading.Lock()
+
+    query = """
+            query (
+                $owner: String!, $repo_name: String!,
+                $first: Int!, $cursor: String
+            ){
+                repository(owner: $owner, name: $repo_name) {
+                    milestones(
+                        first: $first, after: $cursor,
+                        states: [OPEN, CLOSED]
+                    ){
+                        pageInfo {
+                            hasNextPage
+                            endCursor
+                        }
+                        nodes {
+                            title
+                            number
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+
+    def __init__(self, context=None, path=None, page_size=100):
+        self.context = get_repo_context(context)
+        self.path = path
+        self.page_size = page_size
+        self.numbers = {}
+        self.pages_consumed = 0
+        self.syncs = 0
+        self._index_lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.numbers = json.load(f)
+
+    @classmethod
+    def get_index(cls, context=None):
+        """Get shared index of repository
+
+        Args:
+            context (Optional[RepositoryContext]): repository connection
+
+        Returns:
+            MilestoneIndex: index persisted in cache directory
+        """
+        context = get_repo_context(context)
+        with cls._lock:
+            index = cls._indexes.get(context.repo_path)
+            if index is None:
+                index = cls(context, cls.get_default_path(context))
+                cls._indexes[context.repo_path] = index
+        return index
+
+    @classmethod
+    def get_default_path(cls, context=None):
+        from utils import get_cache_dir
+
+        context = get_repo_context(context)
+        return os.path.join(
+            get_cache_dir(), "milestones",
+            context.owner, f"{context.name}.json"
+        )
+
+    def save(self):
+        with self._index_lock:
+            self._save()
+
+    def _save(self):
+        if self.path:
+            write_json_file(self.path, self.numbers)
+
+    def sync(self):
+        """Rebuild index from listing of all milestones"""
+        with self._index_lock:
+            self._sync()
+
+    def _sync(self):
+        variables = {
+            "owner": self.context.owner,
+            "repo_name": self.context.name,
+            "first": self.page_size,
+            "cursor": None
+        }
+        numbers = {}
+        while True:
+            result = run_github_query(
+                self.query, variables, expected_nodes=self.page_size,
+                context=self.context
+            )
+            self.pages_consumed += 1
+            milestones = result["data"]["repository"]["milestones"]
+            for node in milestones["nodes"]:
+                numbers[node["title"]] = node["number"]
+
+            if not milestones["pageInfo"]["hasNextPage"]:
+                break
+            variables["cursor"] = milestones["pageInfo"]["endCursor"]
+
+        self.numbers = numbers
+        self.syncs += 1
+        printer.debug(
+            "Milestone index synced, %s milestones in %s pages",
+            len(numbers), self.pages_consumed
+        )
+        self._save()
+
+    def get_number(self, title, refresh=False):
+        """Get milestone number by exact title
+
+        Args:
+            title (str): milestone title
+            refresh (Optional[bool]): sync index before lookup
 
+        Returns:
+            Union[int, None]: milestone number
+        """
+        if not refresh and title in self.numbers:
+            return self.numbers[title]
 
-def _run_github_query(milestone):
-    """Running query at Github
+        syncs = self.syncs
+        with self._index_lock:
+            # listing done by other thread while waiting is fresh enough
+            if self.syncs == syncs:
+                self._sync()
+            return self.numbers.get(title)
+
+    def set(self, title, number, old_title=None):
+        with self._index_lock:
+            if old_title and self.numbers.get(old_title) == number:
+                self.numbers.pop(old_title)
+            self.numbers[title] = number
+            self._save()
+
+
+def fetch_milestone(milestone, query, context=None, expected_nodes=None):
+    """Fetch milestone by exact title
+
+    Number of milestone is taken from `MilestoneIndex`, index is
+    refreshed once if number belongs to milestone of other title.
 
     Args:
-        milestone (str): milestone name
+        milestone (str): milestone title
+        query (str): GraphQL query with `$owner`, `$repo_name` and
+            `$number` variables resolving `repository.milestone`
+        context (Optional[RepositoryContext]): repository connection
+        expected_nodes (Optional[int]): amount of expected nodes
+
+    Returns:
+        Union[dict, None]: milestone node, None if milestone
+            does not exist
+    """
+    context = get_repo_context(context)
+    index = MilestoneIndex.get_index(context)
+    for refresh in (False, True):
+        number = index.get_number(milestone, refresh=refresh)
+        if number is None:
+            return None
+
+        variables = {
+            "owner": context.owner,
+            "repo_name": context.name,
+            "number": number
+        }
+        result = run_github_query(
+            query, variables, expected_nodes, context=context)
+        milestone_data = result["data"]["repository"]["milestone"]
+        if milestone_data and milestone_data["title"] == milestone:
+            return milestone_data
+        printer.debug(
+            "Milestone %s is not '%s' anymore, refreshing index..",
+            number, milestone
+        )
+    return None
+
+class MilestoneDescription:
+    """Milestone description split into metadata block and body
+
+    Metadata (closing commit, closing tag, hashes of added changelogs)
+    is kept in a delimited block at the top of description, so it is
+    parsed without touching the body and rewritten without scanning it.
+
+    Descriptions written before the block existed keep elements as
+    `key: value` lines at the top, these are moved into the block
+    on next write.
+
+    Line ending of the description is kept when block is rendered.
 
-    Raises:
-        Exception: _description_
+    Args:
+        text (Optional[str]): milestone description
+    """
+    block_start = "<!-- ci-tools:metadata -->"
+    block_end = "<!-- /ci-tools:metadata -->"
+
+    def __init__(self, text=None):
+        self.metadata = {}
+        self.body = ""
+        self.newline = "\n"
+        if text:
+            self._parse(text)
+
+    def __repr__(self) -> str:
+        return f"<MilestoneDescription({self.metadata})>"
+
+    def _parse(self, text):
+        first_line_end = text.find("\n")
+        if first_line_end > 0 and text[first_line_end - 1] == "\r":
+            self.newline = "\r\n"
+
+        match_obj = METADATA_BLOCK_PATTERN.match(text)
+        if match_obj:
+            for line in match_obj.group(2).splitlines():
+                key, _, value = line.partition(":")
+                if value.strip():
+                    self.metadata[key.strip()] = value.strip()
+            self.body = text[match_obj.end():]
+            return
+
+        position = 0
+        while True:
+            match_obj = LEGACY_ELEMENT_PATTERN.match(text, position)
+            if not match_obj:
+                break
+            self.metadata.setdefault(match_obj.group(1), match_obj.group(2))
+            position = match_obj.end()
+        self.body = text[position:]
+
+    @staticmethod
+    def _get_key(element):
+        return element.rstrip(":")
+
+    def get(self, element):
+        """Get element value
+
+        Args:
+            element (str): e.g. `closing-tag:`
+
+        Returns:
+            Union[str, None]: value
+        """
+        return self.metadata.get(self._get_key(element))
+
+    def set(self, element, value):
+        self.metadata[self._get_key(element)] = value
+
+    def append(self, text):
+        """Append text to body unless it was already appended
+
+        Args:
+            text (str): e.g. changelog
+
+        Returns:
+            bool: text was appended
+        """
+        key = self._get_key(MILESTONE_DESC_CHANGELOG)
+        text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+        hashes = self.metadata.get(key, "").split()
+        if text_hash in hashes:
+            return False
+        # body older than tracked hashes has to be searched
+        if not hashes and self.body and text in self.body:
+            return False
+
+        self.body += text
+        self.metadata[key] = " ".join(hashes + [text_hash])
+        return True
+
+    def copy(self):
+        description = type(self)()
+        description.metadata = dict(self.metadata)
+        description.body = self.body
+        description.newline = self.newline
+        return description
+
+    def render(self):
+        """Get description text
+
+        Returns:
+            str: description with metadata block
+        """
+        if not self.metadata:
+            return self.body
+        newline = self.newline
+        lines = "".join(
+            f"{key}: {value}{newline}"
+            for key, value in self.metadata.items()
+        )
+        return (
+            self.block_start + newline + lines
+            + self.block_end + newline + self.body
+        )
+
+
+def get_milestone_description(milestone_data):
+    """Get parsed description of milestone snapshot
+
+    Description is parsed once per snapshot, edit of the returned
+    object has to be done on its copy.
+
+    Args:
+        milestone_data (dict): milestone snapshot
 
     Returns:
-        str: json text
+        MilestoneDescription: parsed description
     """
-    repo_connect = GithubConnect()
+    description = milestone_data.get("parsed_description")
+    if description is None:
+        description = MilestoneDescription(milestone_data["description"])
+        milestone_data["parsed_description"] = description
+    return description
 
-    variables = {
-        "repo_owner": repo_connect.owner,
-        "repo_name": repo_connect.name,
-        "milestone": milestone
-    }
+
+def get_milestone(milestone, context=None, refresh=False):
+    """Get milestone snapshot
+
+    Milestone is queried once and kept in repository context, edits
+    done by `edit_milestone` are written through to the snapshot.
+
+    Args:
+        milestone (str): milestone title
+        context (Optional[RepositoryContext]): repository connection
+        refresh (Optional[bool]): query Github even if snapshot exists
+
+    Returns:
+        Union[dict, None]: with `title`, `url`, `number` and
+            `description` keys, None if milestone does not exist
+    """
+    context = get_repo_context(context)
+    if not refresh and milestone in context.milestones:
+        return context.milestones[milestone]
+
+    milestone_data = fetch_milestone(milestone, QUERY, context)
+    if milestone_data:
+        context.milestones[milestone] = milestone_data
+    return milestone_data
+
+
+def edit_milestone(milestone_data, context=None, **fields):
+    """Edit milestone and update its snapshot from response
+
+    Args:
+        milestone_data (dict): milestone snapshot
+        context (Optional[RepositoryContext]): repository connection
+        **fields: REST fields to change, e.g. `title`, `description`
+
+    Returns:
+        dict: updated milestone snapshot
+    """
+    context = get_repo_context(context)
+    number = milestone_data["number"]
 
     try:
-        # A simple function to use requests.post to make
-        # the API call. Note the json= section.
-        request = requests.post(
-            'https://api.github.com/graphql',
-            json={'query': QUERY, "variables": variables},
-            headers=_get_request_header(),
-            timeout=3
+        # keep-alive session shared with GraphQL queries
+        request = GraphQLClient().session.patch(
+            url=f"{context.api_url}/repos/{context.repo_path}/milestones/{number}",
+            json=fields,
+            headers={
+                "Authorization": f"Bearer {context.token}",
+                "Accept": "application/vnd.github+json"
+            },
+            timeout=10
         )
         request.raise_for_status()
-    except requests.exceptions.RequestException as err:
-        raise requests.exceptions.RequestException(f"Request error: {err}")
     except requests.exceptions.HTTPError as errh:
         raise requests.exceptions.HTTPError(f"Http Error: {errh}")
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(f"Error Connecting: {errc}")
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(f"Timeout Error: {errt}")
-
-    return request.json()
-
-def _get_milestone_from_query_data(data, milestone):
-    returned_nodes = data["data"]["repository"]["milestones"]["nodes"]
-    milestone_data = next(
-        iter(m for m in returned_nodes if milestone == m["title"]),
-        None
-    )
-    return milestone_data
+    except requests.exceptions.RequestException as err:
+        raise requests.exceptions.RequestException(f"Request error: {err}")
+
+    data = request.json()
+    snapshot = {
+        "title": data["title"],
+        "url": data.get("html_url") or milestone_data["url"],
+        "number": data["number"],
+        "description": data.get("description"),
+    }
+    context.milestones.pop(milestone_data["title"], None)
+    context.milestones[snapshot["title"]] = snapshot
+    if snapshot["title"] != milestone_data["title"]:
+        MilestoneIndex.get_index(context).set(
+            snapshot["title"], number, milestone_data["title"])
+    printer.debug(
+        "Milestone %s edited: %s", number, LazyFormat(sorted, fields))
+    return snapshot
+
+
+def repos_options(func):
+    """Add `--repos` and `--max-workers` options to cli command"""
+    func = click.option(
+        "--max-workers", default=8, show_default=True, type=click.INT,
+        help="Amount of repositories processed concurrently with `--repos`"
+    )(func)
+    return click.option(
+        "--repos", multiple=True,
+        help=(
+            "Run for repositories instead of the default one, "
+            "`owner/name`, `name` or glob over organization "
+            "repositories e.g. `ayon-*`. Can be used multiple times "
+            "or comma separated. Prints table of results"
+        )
+    )(func)
 
-def get_element_from_milestone_description(milestone, element):
-    query_back = _run_github_query(milestone)
-    milestone_data = _get_milestone_from_query_data(query_back, milestone)
+
+def _run_for_repos_cli(func, repos, max_workers):
+    print_repos_results(
+        run_for_repos(func, resolve_repo_paths(repos), max_workers))
+
+
+def get_element_from_milestone_description(milestone, element, context=None):
+    context = get_repo_context(context)
+    milestone_data = get_milestone(milestone, context)
 
     if not milestone_data:
-        repo_connect = GithubConnect()
         raise NameError(
             f"Input milestone does not exists: '{milestone}'"
-            f" repo: '{repo_connect.repo_path}'"
+            f" repo: '{context.repo_path}'"
         )
 
-    pattern = re.compile(f"(?:({element}\s))([a-z0-9\.]+)")
-    if not milestone_data["description"]:
-        return
-    matching_groups = pattern.findall(milestone_data["description"])
-    if not matching_groups:
-        return
-
-    match = matching_groups.pop()
-    return match[-1]
+    return get_milestone_description(milestone_data).get(element)
 
 
-def get_commit_from_milestone_description(milestone):
+def get_commit_from_milestone_description(milestone, context=None):
     """Returns a closing commit sha if
 
     it is found in descriptions
 
     Args:
         milestone (str): milestone title
+        context (Optional[RepositoryContext]): repository connection
 
     Returns:
         str: commit sha
     """
-    return get_element_from_milestone_description(milestone, MILESTONE_DESC_COMMIT)
+    return get_element_from_milestone_description(
+        milestone, MILESTONE_DESC_COMMIT, context)
 
 
-def get_tag_from_milestone_description(milestone):
+def get_tag_from_milestone_description(milestone, context=None):
     """Returns a closing tag if
 
     it is found in descriptions
 
     Args:
         milestone (str): milestone title
+        context (Optional[RepositoryContext]): repository connection
 
     Returns:
         str: tag name
     """
-    return get_element_from_milestone_description(milestone, MILESTONE_DESC_TAG)
+    return get_element_from_milestone_description(
+        milestone, MILESTONE_DESC_TAG, context)
 
 
 @click.command(
@@ -161,7 +552,8 @@ def get_tag_from_milestone_description(milestone):
     "--milestone", required=True,
     help="Name of milestone > `1.0.1`"
 )
-def get_commit_from_milestone_description_cli(milestone):
+@repos_options
+def get_commit_from_milestone_description_cli(milestone, repos, max_workers):
     """Wrapping cli function
 
     Returns a closing commit sha if
@@ -173,6 +565,14 @@ def get_commit_from_milestone_description_cli(milestone):
     Returns:
         str: commit sha
     """
+    if repos:
+        _run_for_repos_cli(
+            lambda context: get_commit_from_milestone_description(
+                milestone, context),
+            repos, max_workers
+        )
+        return
+
     commit_sha = get_commit_from_milestone_description(milestone)
     if commit_sha:
         print(commit_sha)
@@ -188,7 +588,8 @@ def get_commit_from_milestone_description_cli(milestone):
     "--milestone", required=True,
     help="Name of milestone > `1.0.1`"
 )
-def get_tag_from_milestone_description_cli(milestone):
+@repos_options
+def get_tag_from_milestone_description_cli(milestone, repos, max_workers):
     """Wrapping cli function
 
     Returns a closing tag name if
@@ -200,53 +601,51 @@ def get_tag_from_milestone_description_cli(milestone):
     Returns:
         str: tag name
     """
+    if repos:
+        _run_for_repos_cli(
+            lambda context: get_tag_from_milestone_description(
+                milestone, context),
+            repos, max_workers
+        )
+        return
+
     tag_name = get_tag_from_milestone_description(milestone)
     if tag_name:
         print(tag_name)
 
 
-def set_element_to_milestone_description(milestone, element, value):
-    query_back = _run_github_query(milestone)
-    milestone_data = _get_milestone_from_query_data(query_back, milestone)
+def set_element_to_milestone_description(
+    milestone, element, value, context=None
+):
+    context = get_repo_context(context)
+    milestone_data = get_milestone(milestone, context)
 
     if not milestone_data:
         raise NameError(f"Input milestone does not exists: '{milestone}'")
 
+    description = get_milestone_description(milestone_data)
     # avoid duplicity in elements
-    if (
-        "COMMIT" in element
-        and get_commit_from_milestone_description(milestone)
-    ):
+    if description.get(element):
         return False
-    if (
-        "TAG" in element
-        and get_tag_from_milestone_description(milestone)
-    ):
-        return False
-
-    repo = GithubConnect().remote_repo
-    milestone_obj = repo.get_milestone(number=milestone_data["number"])
-    milestone_description = milestone_data["description"]
-    commit_line = f"{element} {value}\n"
-    new_description = commit_line
 
-    if milestone_description:
-        new_description += milestone_description
-
-    milestone_obj.edit(
-        title=milestone_data["title"],
-        description=new_description,
-        due_on=datetime.now()
+    description = description.copy()
+    description.set(element, value)
+    edit_milestone(
+        milestone_data, context,
+        description=description.render(),
+        due_on=datetime.now().strftime("%Y-%m-%d")
     )
     return True
 
 
-def set_commit_to_milestone_description(milestone, commit_sha):
-    return set_element_to_milestone_description(milestone, MILESTONE_DESC_COMMIT, commit_sha)
+def set_commit_to_milestone_description(milestone, commit_sha, context=None):
+    return set_element_to_milestone_description(
+        milestone, MILESTONE_DESC_COMMIT, commit_sha, context)
 
 
-def set_tag_to_milestone_description(milestone, tag_name):
-    return set_element_to_milestone_description(milestone, MILESTONE_DESC_TAG, tag_name)
+def set_tag_to_milestone_description(milestone, tag_name, context=None):
+    return set_element_to_milestone_description(
+        milestone, MILESTONE_DESC_TAG, tag_name, context)
 
 
 @click.command(
@@ -263,7 +662,18 @@ def set_tag_to_milestone_description(milestone, tag_name):
     "--commit-sha", required=True,
     help="The commit hash which should be added to milestone"
 )
-def set_commit_to_milestone_description_cli(milestone, commit_sha):
+@repos_options
+def set_commit_to_milestone_description_cli(
+    milestone, commit_sha, repos, max_workers
+):
+    if repos:
+        _run_for_repos_cli(
+            lambda context: set_commit_to_milestone_description(
+                milestone, commit_sha, context),
+            repos, max_workers
+        )
+        return
+
     print(
         set_commit_to_milestone_description(milestone, commit_sha)
     )
@@ -283,15 +693,28 @@ def set_commit_to_milestone_description_cli(milestone, commit_sha):
     "--tag-name", required=True,
     help="The tag name which should be added to milestone"
 )
-def set_tag_to_milestone_description_cli(milestone, tag_name):
+@repos_options
+def set_tag_to_milestone_description_cli(
+    milestone, tag_name, repos, max_workers
+):
+    if repos:
+        _run_for_repos_cli(
+            lambda context: set_tag_to_milestone_description(
+                milestone, tag_name, context),
+            repos, max_workers
+        )
+        return
+
     print(
         set_tag_to_milestone_description(milestone, tag_name)
     )
 
 
-def set_changelog_to_milestone_description(milestone, changelog_path):
-    query_back = _run_github_query(milestone)
-    milestone_data = _get_milestone_from_query_data(query_back, milestone)
+def set_changelog_to_milestone_description(
+    milestone, changelog_path, context=None
+):
+    context = get_repo_context(context)
+    milestone_data = get_milestone(milestone, context)
 
     if not milestone_data:
         raise NameError(f"Input milestone does not exists: '{milestone}'")
@@ -300,17 +723,13 @@ def set_changelog_to_milestone_description(milestone, changelog_path):
     with open(changelog_path, 'r', encoding="UTF-8") as f:
         changelog = f.read()
 
-    repo = GithubConnect().remote_repo
-    milestone_obj = repo.get_milestone(number=milestone_data["number"])
-    milestone_description = milestone_data["description"]
-
-    if changelog in milestone_description:
+    description = get_milestone_description(milestone_data).copy()
+    if not description.append(changelog):
         return False
 
-    milestone_description = milestone_description + changelog
-    milestone_obj.edit(
-        title=milestone_data["title"],
-        description=milestone_description,
+    edit_milestone(
+        milestone_data, context,
+        description=description.render(),
     )
     return True
 
@@ -329,24 +748,31 @@ def set_changelog_to_milestone_description(milestone, changelog_path):
     "--changelog-path", required=True,
     help="Changelog path"
 )
-def set_changelog_to_milestone_description_cli(milestone, changelog_path):
+@repos_options
+def set_changelog_to_milestone_description_cli(
+    milestone, changelog_path, repos, max_workers
+):
+    if repos:
+        _run_for_repos_cli(
+            lambda context: set_changelog_to_milestone_description(
+                milestone, changelog_path, context),
+            repos, max_workers
+        )
+        return
+
     print(
         set_changelog_to_milestone_description(milestone, changelog_path)
     )
 
 
-def set_new_milestone_title(milestone, new_title):
-    query_back = _run_github_query(milestone)
-    milestone_data = _get_milestone_from_query_data(query_back, milestone)
+def set_new_milestone_title(milestone, new_title, context=None):
+    context = get_repo_context(context)
+    milestone_data = get_milestone(milestone, context)
 
     if not milestone_data:
         raise NameError(f"Input milestone does not exists: '{milestone}'")
 
-    repo = GithubConnect().remote_repo
-    milestone_obj = repo.get_milestone(number=milestone_data["number"])
-    milestone_obj.edit(
-        title=new_title
-    )
+    edit_milestone(milestone_data, context, title=new_title)
     return True
 
 
@@ -364,7 +790,124 @@ def set_new_milestone_title(milestone, new_title):
     "--new-title", required=True,
     help="New milestone title"
 )
-def set_new_milestone_title_cli(milestone, new_title):
+@repos_options
+def set_new_milestone_title_cli(milestone, new_title, repos, max_workers):
+    if repos:
+        _run_for_repos_cli(
+            lambda context: set_new_milestone_title(
+                milestone, new_title, context),
+            repos, max_workers
+        )
+        return
+
     print(
         set_new_milestone_title(milestone, new_title)
-    )
\ No newline at end of file
+    )
+
+
+def update_milestone(
+    milestone,
+    commit_sha=None,
+    tag_name=None,
+    new_title=None,
+    changelog_path=None,
+    context=None
+):
+    """Update milestone description and title at once
+
+    Changes are merged the same way as by separate `set_*` functions
+    (commit and tag are not replaced if already set, changelog is not
+    added twice) and sent in one request.
+
+    Args:
+        milestone (str): milestone title
+        commit_sha (Optional[str]): closing commit hash
+        tag_name (Optional[str]): closing tag name
+        new_title (Optional[str]): new milestone title
+        changelog_path (Optional[str]): path to changelog file
+        context (Optional[RepositoryContext]): repository connection
+
+    Returns:
+        bool: milestone was changed
+    """
+    context = get_repo_context(context)
+    milestone_data = get_milestone(milestone, context)
+
+    if not milestone_data:
+        raise NameError(f"Input milestone does not exists: '{milestone}'")
+
+    description = get_milestone_description(milestone_data).copy()
+    fields = {}
+    changed = False
+    for element, value in (
+        (MILESTONE_DESC_COMMIT, commit_sha),
+        (MILESTONE_DESC_TAG, tag_name),
+    ):
+        if value and not description.get(element):
+            description.set(element, value)
+            fields["due_on"] = datetime.now().strftime("%Y-%m-%d")
+            changed = True
+
+    if changelog_path:
+        with open(changelog_path, 'r', encoding="UTF-8") as f:
+            changelog = f.read()
+        changed = description.append(changelog) or changed
+
+    if changed:
+        fields["description"] = description.render()
+    if new_title and new_title != milestone_data["title"]:
+        fields["title"] = new_title
+
+    if not fields:
+        return False
+
+    edit_milestone(milestone_data, context, **fields)
+    return True
+
+
+@click.command(
+    name="update",
+    help=(
+        "Set commit, tag, changelog and title of milestone "
+        "with one request"
+    )
+)
+@click.option(
+    "--milestone", required=True,
+    help="Name of milestone > `1.0.1`"
+)
+@click.option(
+    "--commit-sha", required=False,
+    help="The commit hash which should be added to milestone"
+)
+@click.option(
+    "--tag-name", required=False,
+    help="The tag name which should be added to milestone"
+)
+@click.option(
+    "--new-title", required=False,
+    help="New milestone title"
+)
+@click.option(
+    "--changelog-path", required=False,
+    help="Changelog path"
+)
+@repos_options
+def update_milestone_cli(
+    milestone, commit_sha, tag_name, new_title, changelog_path,
+    repos, max_workers
+):
+    if repos:
+        _run_for_repos_cli(
+            lambda context: update_milestone(
+                milestone, commit_sha, tag_name, new_title,
+                changelog_path, context
+            ),
+            repos, max_workers
+        )
+        return
+
+    print(
+        update_milestone(
+            milestone, commit_sha, tag_name, new_title, changelog_path)
+    )
@@ -1,18 +1,13 @@
 import re
 import platform
 import click
-import requests
 import asyncio
 import aiohttp
 from pprint import pformat
-from repository import GithubConnect
-from utils import Printer
-printer = Printer()
-
-def _get_request_header():
-    repo_connect = GithubConnect()
-
-    return {"Authorization": f"Bearer {repo_connect.token}"}
+from repository import get_repo_context
+from milestones import fetch_milestone
+from utils import Printer, LazyFormat
+printer = Printer(__name__)
 
 class PullRequestDescription:
     title: str
@@ -41,40 +36,47 @@ class PullRequestDescription:
 
 
 class MilestonePRProcessor:
-    repo_connect = GithubConnect()
-
     query = """
             query (
-                $owner: String!, $repo_name: String!, $milestone: String!
+                $owner: String!, $repo_name: String!, $number: Int!
             ){
                 repository(owner: $owner, name: $repo_name) {
-                    milestones(query: $milestone, first: 1) {
-                        nodes{
-                            title
-                            url
-                            number
-                            pullRequests(states:[OPEN, MERGED], first: 1000){
-                                nodes{
-                                    title
-                                    url
-                                    number
-                                    headRefName
-                                }
+                    milestone(number: $number) {
+                        title
+                        url
+                        number
+                        pullRequests(states:[OPEN, MERGED], first: 1000){
+                            nodes{
+                                title
+                                url
+                                number
+                                headRefName
                             }
                         }
                     }
                 }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
             }
         """
 
     _pullrequests: list[PullRequestDescription] = []
 
-    def __init__(self, milestone) -> None:
+    def __init__(self, milestone, context=None) -> None:
+        self.repo_connect = get_repo_context(context)
+        self._pullrequests = []
+
         # Execute the query
-        result = self._run_github_query(milestone)
+        milestone_data = self._run_github_query(milestone)
+        if not milestone_data:
+            raise NameError(
+                f"Input milestone does not exists: '{milestone}'"
+                f" repo: '{self.repo_connect.repo_path}'"
+            )
 
-        # Drill down the dictionary
-        milestone_data = result["data"]['repository']['milestones']['nodes'].pop()
         pullrequest_data = milestone_data.pop("pullRequests")
         assert pullrequest_data, "Missing PullRequest in Milestone"
 
@@ -82,8 +84,9 @@ class MilestonePRProcessor:
             pull = PullRequestDescription(**pr_)
             self._pullrequests.append(pull)
 
-        printer.echo(f"Amount or Collected PRs {len(self._pullrequests)}")
-        printer.echo(f"Collected PRs {pformat(self._pullrequests)}")
+        printer.debug("Amount or Collected PRs %s", len(self._pullrequests))
+        printer.debug(
+            "Collected PRs %s", LazyFormat(pformat, self._pullrequests))
 
     @property
     def pulls(self):
@@ -95,48 +98,21 @@ class MilestonePRProcessor:
         Args:
             milestone (str): milestone name
 
-        Raises:
-            Exception: _description_
-
         Returns:
-            str: json text
+            dict: milestone data, None if milestone does not exist
         """
-        variables = {
-            "owner": self.repo_connect.owner,
-            "repo_name": self.repo_connect.name,
-            "milestone": milestone
-        }
-
-        try:
-            # A simple function to use requests.post to make
-            # the API call. Note the json= section.
-            request = requests.post(
-                'https://api.github.com/graphql',
-                json={'query': self.query, "variables": variables},
-                headers=_get_request_header(),
-                timeout=3
-            )
-            request.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            raise requests.exceptions.RequestException(f"Request error: {err}")
-        except requests.exceptions.HTTPError as errh:
-            raise requests.exceptions.HTTPError(f"Http Error: {errh}")
-        except requests.exceptions.ConnectionError as errc:
-            raise requests.exceptions.ConnectionError(f"Error Connecting: {errc}")
-        except requests.exceptions.Timeout as errt:
-            raise requests.exceptions.Timeout(f"Timeout Error: {errt}")
-
-        return request.json()
+        return fetch_milestone(
+            milestone, self.query, self.repo_connect, expected_nodes=1000)
 
 async def put_clickup_request(session, url, headers, payload, query):
     async with session.post(url, json=payload, headers=headers, params=query ) as resp:
             response = await resp.json()
-            printer.echo(pformat(response))
+            printer.debug("%s", LazyFormat(pformat, response))
 
-async def milestone_prs_to_clickup(context, milestone):
+async def milestone_prs_to_clickup(context, milestone, repo_context=None):
 
     skipping_prs = []
-    milestone_prs_proc = MilestonePRProcessor(milestone)
+    milestone_prs_proc = MilestonePRProcessor(milestone, repo_context)
 
     # define all variables from context
     field_id = context.obj["CLICKUP_RELEASE_FIELD_ID"]
@@ -151,23 +127,26 @@ async def milestone_prs_to_clickup(context, milestone):
         "team_id": context.obj["CLICKUP_TEAM_ID"]
     }
 
-    printer.echo(f"{headers}")
-    printer.echo(f"{query}")
+    printer.debug("%s", headers)
+    printer.debug("%s", query)
 
     async with aiohttp.ClientSession() as session:
         tasks = []
         print("Total PRs: ", len(milestone_prs_proc.pulls))
         for pr_ in milestone_prs_proc.pulls:
-            printer.echo("__________________")
+            printer.debug("__________________")
             clickup_custom_id = None
             found = re.findall(r"AY-\d+|OP-\d+", pr_.head_ref)
             if found:
                 clickup_custom_id = found.pop()
-                printer.echo(f"Found Clickup ID {clickup_custom_id}")
+                printer.debug("Found Clickup ID %s", clickup_custom_id)
 
             if not clickup_custom_id:
                 skipping_prs.append(str(pr_.number))
-                printer.echo(f"Skipping PR: '{pr_.number}' / '{pr_.get_title()}' / '{pr_.head_ref}'")
+                printer.debug(
+                    "Skipping PR: '%s' / '%s' / '%s'",
+                    pr_.number, pr_.title, pr_.head_ref
+                )
                 continue
 
             payload = {
@@ -175,10 +154,13 @@ async def milestone_prs_to_clickup(context, milestone):
             }
 
             url = (
-                f"https://api.clickup.com/api/v2/task/{clickup_custom_id}"
+                f"{context.obj['CLICKUP_API_URL']}/task/{clickup_custom_id}"
                 f"/field/{field_id}"
             )
-            printer.echo(f"Processing PR: '{pr_.number}' / '{pr_.get_title()}' / '{pr_.head_ref}'")
+            printer.debug(
+                "Processing PR: '%s' / '%s' / '%s'",
+                pr_.number, pr_.title, pr_.head_ref
+            )
             print(f"PR: '{pr_.number}' to CU Task: '{clickup_custom_id}'")
 
             # add task to list for later async execution
@@ -191,7 +173,7 @@ async def milestone_prs_to_clickup(context, milestone):
         # execute all tasks and get answers
         put_answers = await asyncio.gather(*tasks)
         for answers in put_answers:
-            printer.echo(answers)
+            printer.debug("%s", answers)
 
         print(f"Skipped PRs: {' '.join(skipping_prs)}")
         print("Total skipped PRs: ", len(skipping_prs))
@@ -214,7 +196,7 @@ def milestone_prs_to_clickup_cli(ctx, milestone):
         milestone (str): milestone name
     """
 
-    printer.echo("Generating changelog from milestone...")
+    printer.debug("Generating changelog from milestone...")
 
     # to avoid: `RuntimeError: Event loop is closed` on Windows
     if platform.platform().startswith("Windows"):
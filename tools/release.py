@@ -0,0 +1,359 @@
+"""
+Milestone release as one process.
+
+Steps of `milestone_release_ref.yml` are modeled as a dependency graph.
+Every step declares its dependencies and the type of its output, steps
+with satisfied dependencies run concurrently and share one Github
+connection and one GraphQL session.
+
+Independent branches of the graph are for example changelog generation
+next to version lookup, or ClickUp update next to file version bumps.
+Edits of milestone are serialized to avoid lost updates.
+"""
+import sys
+import time
+import contextlib
+import asyncio
+import platform
+import click
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from semver import VersionInfo
+from utils import Printer
+
+printer = Printer(__name__)
+
+NoneType = type(None)
+
+
+class ReleaseStep:
+    """Single step of release graph
+
+    Args:
+        name (str): step name
+        func (callable): called with outputs of dependencies
+            as keyword arguments (dashes replaced by underscores)
+        deps (Optional[list[str]]): names of steps required before
+        output_type (Optional[tuple[type]]): allowed output types
+    """
+
+    def __init__(self, name, func, deps=None, output_type=(NoneType,)):
+        self.name = name
+        self.func = func
+        self.deps = deps or []
+        self.output_type = output_type
+
+    def __repr__(self) -> str:
+        return f"<ReleaseStep('{self.name}')>"
+
+    def run(self, results):
+        kwargs = {
+            dep.replace("-", "_"): results[dep]
+            for dep in self.deps
+        }
+        output = self.func(**kwargs)
+        if not isinstance(output, self.output_type):
+            raise TypeError(
+                f"Step '{self.name}' returned '{type(output).__name__}', "
+                f"expected {[t.__name__ for t in self.output_type]}"
+            )
+        return output
+
+
+class ReleaseGraph:
+    """Executor of release steps respecting their dependencies
+
+    Args:
+        steps (list[ReleaseStep]): steps of release
+        max_workers (Optional[int]): amount of concurrently running steps
+    """
+
+    def __init__(self, steps, max_workers=4):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+        self.results = {}
+        self.timings = {}
+        self._validate()
+
+    def _validate(self):
+        for step in self.steps.values():
+            missing = [dep for dep in step.deps if dep not in self.steps]
+            if missing:
+                raise KeyError(
+                    f"Step '{step.name}' depends on unknown steps {missing}")
+
+        # detect cycles with topological walk
+        resolved = set()
+        pending = dict(self.steps)
+        while pending:
+            ready = [
+                name for name, step in pending.items()
+                if all(dep in resolved for dep in step.deps)
+            ]
+            if not ready:
+                raise ValueError(
+                    f"Cyclic dependency in steps {list(pending)}")
+            for name in ready:
+                resolved.add(name)
+                pending.pop(name)
+
+    def _timed_run(self, step):
+        start = time.perf_counter()
+        output = step.run(self.results)
+        self.timings[step.name] = time.perf_counter() - start
+        return output
+
+    def run(self):
+        """Run all steps
+
+        Raises:
+            Exception: first exception raised by any step, steps not
+                started yet are not executed
+
+        Returns:
+            dict: step name mapped to its output
+        """
+        pending = dict(self.steps)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                ready = [
+                    name for name, step in pending.items()
+                    if all(dep in self.results for dep in step.deps)
+                ]
+                for name in ready:
+                    step = pending.pop(name)
+                    printer.debug("Starting step '%s'..", name)
+                    running[executor.submit(self._timed_run, step)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    # re-raise step exception and stop scheduling
+                    self.results[name] = future.result()
+                    printer.debug("Finished step '%s'..", name)
+
+        return self.results
+
+
+def get_milestone_release_steps(
+    context, milestone, base_branch, version_path, pyproject_path,
+    changelog_path, clickup=True, repo_context=None
+):
+    """Get steps of milestone release
+
+    Mirrors `milestone_release_ref.yml` steps.
+
+    Args:
+        context (click.Context): cli context
+        milestone (str): milestone title (`next-patch` or version)
+        base_branch (str): branch which commit closes milestone
+        version_path (str): path to version.py
+        pyproject_path (str): path to pyproject.toml
+        changelog_path (str): path to CHANGELOG.md
+        clickup (Optional[bool]): set release version to ClickUp tasks
+        repo_context (Optional[RepositoryContext]): repository connection
+
+    Returns:
+        list[ReleaseStep]: release steps
+    """
+    from milestones import (
+        get_commit_from_milestone_description,
+        get_tag_from_milestone_description,
+        set_commit_to_milestone_description,
+        set_tag_to_milestone_description,
+        set_new_milestone_title
+    )
+    from repository import get_latest_commit, get_repo_context
+    from versioning import current_version, bump_file_versions
+    from changelog import (
+        ChangeLogMilestoneProcessor,
+        get_changelog_release_head,
+        write_changelog_temp_file,
+        add_to_changelog
+    )
+
+    repo_context = get_repo_context(repo_context)
+    next_milestone = milestone.startswith("next-")
+
+    def _set_milestone_commit(milestone_commit, base_commit):
+        if milestone_commit:
+            return milestone_commit
+        set_commit_to_milestone_description(
+            milestone, base_commit, repo_context)
+        return base_commit
+
+    def _current_version():
+        if next_milestone:
+            return current_version("release", context=repo_context)
+        tag = get_tag_from_milestone_description(milestone, repo_context)
+        if not tag:
+            raise click.ClickException(
+                f"Milestone '{milestone}' has no tag in its description, "
+                "set it with `milestones update --tag-name`"
+            )
+        return tag
+
+    def _next_version(current_version):
+        if next_milestone:
+            return str(VersionInfo.parse(current_version).bump_patch())
+        return milestone
+
+    def _set_milestone_tag(set_milestone_commit, current_version):
+        if next_milestone:
+            set_tag_to_milestone_description(
+                milestone, current_version, repo_context)
+
+    def _set_milestone_title(set_milestone_tag, changelog_body, next_version):
+        if next_milestone:
+            set_new_milestone_title(milestone, next_version, repo_context)
+
+    def _changelog(changelog_body, current_version, next_version):
+        head = get_changelog_release_head(
+            current_version, next_version, repo_context)
+        return write_changelog_temp_file(head + changelog_body)
+
+    def _prs_to_clickup(set_milestone_title, next_version):
+        from project_management import milestone_prs_to_clickup
+
+        # to avoid: `RuntimeError: Event loop is closed` on Windows
+        if platform.platform().startswith("Windows"):
+            asyncio.set_event_loop_policy(
+                asyncio.WindowsSelectorEventLoopPolicy())
+        asyncio.run(
+            milestone_prs_to_clickup(context, next_version, repo_context))
+
+    steps = [
+        ReleaseStep(
+            "milestone-commit",
+            lambda: get_commit_from_milestone_description(
+                milestone, repo_context),
+            output_type=(str, NoneType)
+        ),
+        ReleaseStep(
+            "base-commit",
+            lambda: get_latest_commit(base_branch, context=repo_context),
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "set-milestone-commit", _set_milestone_commit,
+            deps=["milestone-commit", "base-commit"],
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "current-version", _current_version,
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "next-version", _next_version,
+            deps=["current-version"],
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "set-milestone-tag", _set_milestone_tag,
+            deps=["set-milestone-commit", "current-version"]
+        ),
+        # changelog is collected by original title so before renaming
+        ReleaseStep(
+            "changelog-body",
+            lambda: ChangeLogMilestoneProcessor(
+                milestone, repo_context).generate(),
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "set-milestone-title", _set_milestone_title,
+            deps=["set-milestone-tag", "changelog-body", "next-version"]
+        ),
+        ReleaseStep(
+            "changelog", _changelog,
+            deps=["changelog-body", "current-version", "next-version"],
+            output_type=(str,)
+        ),
+        ReleaseStep(
+            "add-to-changelog-file",
+            lambda changelog, next_version: add_to_changelog(
+                changelog, changelog_path, next_version, repo_context),
+            deps=["changelog", "next-version"],
+            output_type=(bool,)
+        ),
+        ReleaseStep(
+            "bump-file-version",
+            lambda next_version: bump_file_versions(
+                next_version, version_path, pyproject_path),
+            deps=["next-version"]
+        ),
+    ]
+    if clickup:
+        steps.append(
+            ReleaseStep(
+                "prs-to-clickup", _prs_to_clickup,
+                deps=["set-milestone-title", "next-version"]
+            )
+        )
+    return steps
+
+
+@click.command(
+    name="run",
+    help=(
+        "Run whole milestone release in one process. "
+        "Independent steps are running concurrently. "
+        "Prints outputs as `key=value` lines and step timings to stderr."
+    )
+)
+@click.option(
+    "--milestone", required=True,
+    help="Name of milestone > `next-patch` or `1.0.1`"
+)
+@click.option(
+    "--base-branch", default="develop", show_default=True,
+    help="Branch which latest commit closes the milestone"
+)
+@click.option(
+    "--version-path", required=True,
+    help="Relative/absolute path to version.py from project root"
+)
+@click.option(
+    "--pyproject-path", required=True,
+    help="Relative/absolute path to pyproject.toml from project root"
+)
+@click.option(
+    "--changelog-path", default="./CHANGELOG.md", show_default=True,
+    help="Path to current changelog file"
+)
+@click.option(
+    "--clickup/--no-clickup", default=True,
+    help="Set release version to ClickUp tasks"
+)
+@click.option(
+    "--max-workers", default=4, show_default=True, type=click.INT,
+    help="Amount of concurrently running steps"
+)
+@click.pass_context
+def release_run_cli(
+    ctx, milestone, base_branch, version_path, pyproject_path,
+    changelog_path, clickup, max_workers
+):
+    steps = get_milestone_release_steps(
+        ctx, milestone, base_branch, version_path, pyproject_path,
+        changelog_path, clickup
+    )
+    graph = ReleaseGraph(steps, max_workers=max_workers)
+
+    start = time.perf_counter()
+    try:
+        # stdout carries only the `key=value` outputs below, print
+        # chatter of steps (e.g. prs-to-clickup) goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            results = graph.run()
+    finally:
+        for name, duration in graph.timings.items():
+            click.echo(f"{name:<24} {duration:8.3f} s", err=True)
+        click.echo(
+            f"{'total':<24} {time.perf_counter() - start:8.3f} s", err=True)
+
+    print(f"milestone_commit={results['milestone-commit'] or ''}")
+    print(f"commit={results['set-milestone-commit']}")
+    print(f"current_version={results['current-version']}")
+    print(f"next_version={results['next-version']}")
+    print(f"changelog_path={results['changelog']}")
+    print(f"updated={results['add-to-changelog-file']}")
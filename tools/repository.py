@@ -1,27 +1,34 @@
-
+import fnmatch
+import threading
 import click
-from github.Repository import Repository
-from github import Github
-from git import Repo
 from utils import Printer
 
-printer = Printer()
+printer = Printer(__name__)
 
 
-class GithubConnect:
-    _remote_repo: Repository
-    _github: Github
-    _owner: str
-    _name: str
-    _path: str
-    _token: str
+class RepositoryContext:
+    """Connection context of one Github repository
 
-    def __init__(self):
-        pass
+    Token and api url (and so the rate limit) are shared by all
+    contexts of registry. Github is queried through GraphQL by `owner`
+    and `name`, so no repository object has to be resolved.
 
-    @property
-    def remote_repo(self):
-        return self._remote_repo
+    `milestones` holds milestone snapshots by title, they are valid
+    for one cli command (see `milestones.get_milestone`).
+
+    Args:
+        owner (str): repository organization or owner
+        name (str): repository name
+    """
+
+    def __init__(self, owner, name):
+        self._owner = owner
+        self._name = name
+        self._path = f"{owner}/{name}"
+        self.milestones = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self._path}>"
 
     @property
     def name(self):
@@ -37,34 +44,418 @@ class GithubConnect:
 
     @property
     def token(self):
-        return self._token
+        return GithubConnect.get_token()
 
     @property
-    def github(self):
-        return self._github
+    def api_url(self):
+        return GithubConnect.get_api_url()
+
+
+class GithubConnect:
+    """Registry of repository connection contexts
+
+    Contexts are keyed by `owner/name`. Connection attributes (token,
+    api url) are common for all of them so one process can work with
+    many repositories through one connection pool.
+    """
+    _token: str = None
+    _api_url: str = "https://api.github.com"
+    _contexts: dict = {}
+    _default: str = None
+    _owner: str = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_token(cls):
+        return cls._token
 
     @classmethod
-    def set_attributes(cls, owner, name, token):
-        cls._github = Github(token)
-        cls._owner = owner
-        cls._name = name
-        cls._token = token
-        cls._path = f"{owner}/{name}"
-        cls._remote_repo = cls._github.get_repo(cls._path)
+    def get_api_url(cls):
+        return cls._api_url
+
+    @classmethod
+    def get_owner(cls):
+        return cls._owner
+
+    @classmethod
+    def set_attributes(cls, owner, name, token, api_url=None):
+        """Register connection attributes and default repository
+
+        Nothing is requested from Github here.
+
+        Args:
+            owner (str): default repository organization or owner
+            name (str): default repository name
+            token (str): Github token
+            api_url (Optional[str]): Github API root url
+        """
+        api_url = (api_url or "https://api.github.com").rstrip("/")
+        with cls._lock:
+            # keep contexts warm if nothing changed
+            if (token, api_url) != (cls._token, cls._api_url):
+                cls._contexts = {}
+            # daemon keeps contexts between commands, milestones
+            # may have been changed by someone else meanwhile
+            for context in cls._contexts.values():
+                context.milestones.clear()
+            cls._api_url = api_url
+            cls._token = token
+            cls._owner = owner
+            cls._default = None
+            if owner and name:
+                cls._default = f"{owner}/{name}"
+
+    @classmethod
+    def get_context(cls, repo_path=None):
+        """Get connection context of repository
+
+        Args:
+            repo_path (Optional[str]): `owner/name`, default repository
+                is used if not set
+
+        Raises:
+            ValueError: when repository is not set and there is
+                no default one
+
+        Returns:
+            RepositoryContext: context
+        """
+        repo_path = repo_path or cls._default
+        if not repo_path or "/" not in repo_path:
+            raise ValueError(
+                f"Repository must be in `owner/name` form: '{repo_path}'")
+
+        with cls._lock:
+            context = cls._contexts.get(repo_path)
+            if context is None:
+                owner, name = repo_path.split("/", 1)
+                context = RepositoryContext(owner, name)
+                cls._contexts[repo_path] = context
+        return context
+
+
+def get_repo_context(context=None):
+    """Get connection context
+
+    Args:
+        context (Optional[Union[RepositoryContext, str]]): context,
+            `owner/name` or None for default repository
+
+    Returns:
+        RepositoryContext: context
+    """
+    if isinstance(context, RepositoryContext):
+        return context
+    return GithubConnect.get_context(context)
+
+
+OWNER_REPOSITORIES_QUERY = """
+    query (
+        $owner: String!, $cursor: String
+    ){
+        organization(login: $owner) {
+            repositories(first: 100, after: $cursor) {
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                edges {
+                    node {
+                        name
+                        isArchived
+                    }
+                }
+            }
+        }
+        rateLimit {
+            cost
+            remaining
+            resetAt
+        }
+    }
+"""
+
+
+def get_owner_repositories(owner):
+    """Get names of not archived repositories of organization
+
+    Args:
+        owner (str): organization login
+
+    Returns:
+        list[str]: repository names
+    """
+    from graphql_client import run_github_query
+
+    variables = {"owner": owner, "cursor": None}
+    names = []
+    while True:
+        result = run_github_query(
+            OWNER_REPOSITORIES_QUERY, variables, expected_nodes=100)
+        repositories = result["data"]["organization"]["repositories"]
+        names.extend(
+            edge["node"]["name"]
+            for edge in repositories["edges"]
+            if not edge["node"]["isArchived"]
+        )
+        if not repositories["pageInfo"]["hasNextPage"]:
+            return names
+        variables["cursor"] = repositories["pageInfo"]["endCursor"]
+
+
+def resolve_repo_paths(patterns):
+    """Get repositories matching patterns
+
+    Organization is listed only if some pattern is a glob.
+
+    Args:
+        patterns (list[str]): `owner/name`, `name` or glob like
+            `ayon-*`, items can be comma separated lists, default
+            owner is used where owner is missing
+
+    Returns:
+        list[str]: unique `owner/name` in order of patterns
+    """
+    listings = {}
+    repo_paths = []
+    for pattern in ",".join(patterns).split(","):
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        owner, _, name = pattern.rpartition("/")
+        owner = owner or GithubConnect.get_owner()
+        if not owner:
+            raise ValueError(f"Missing owner of repository '{pattern}'")
+
+        if not any(char in name for char in "*?["):
+            repo_paths.append(f"{owner}/{name}")
+            continue
+
+        if owner not in listings:
+            listings[owner] = get_owner_repositories(owner)
+        matching = fnmatch.filter(listings[owner], name)
+        if not matching:
+            printer.warning(
+                "No repository of '%s' matches '%s'", owner, name)
+        repo_paths.extend(f"{owner}/{match}" for match in matching)
+
+    return list(dict.fromkeys(repo_paths))
+
+
+async def _run_for_repos(func, repo_paths, max_workers):
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def _run(repo_path):
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(
+                    func, GithubConnect.get_context(repo_path))
+            except Exception as err:
+                printer.debug("'%s' failed: %s", repo_path, err)
+                return repo_path, None, err
+            return repo_path, result, None
+
+    return await asyncio.gather(*(_run(path) for path in repo_paths))
+
+
+def run_for_repos(func, repo_paths, max_workers=8):
+    """Run function for many repositories concurrently
+
+    Blocking Github calls run in at most `max_workers` threads at once,
+    all of them share connection registry and GraphQL session.
+
+    Args:
+        func (Callable[[RepositoryContext], Any]): called with context
+            of each repository
+        repo_paths (list[str]): `owner/name` of repositories
+        max_workers (Optional[int]): amount of concurrent repositories
+
+    Returns:
+        list[tuple[str, Any, Union[Exception, None]]]: repository,
+            result and error in order of `repo_paths`
+    """
+    import asyncio
+
+    return asyncio.run(_run_for_repos(func, repo_paths, max_workers))
+
+
+def print_repos_results(results):
+    """Print table of results per repository
+
+    Args:
+        results (list[tuple[str, Any, Union[Exception, None]]]): output
+            of `run_for_repos`
+
+    Raises:
+        click.ClickException: some repository failed
+    """
+    width = max([len("repository")] + [len(path) for path, _, _ in results])
+    print(f"{'repository':<{width}}  result")
+    for repo_path, result, error in results:
+        if error is not None:
+            result = f"ERROR {type(error).__name__}: {error}"
+        elif result is None:
+            result = ""
+        print(f"{repo_path:<{width}}  {result}")
+
+    failed = [path for path, _, error in results if error is not None]
+    if failed:
+        raise click.ClickException(
+            f"Failed in {len(failed)} of {len(results)} repositories")
 
 
 def get_local_git_repo(repo_path):
+    from git import Repo
+
     return Repo(repo_path)
 
-def get_latest_commit(branch):
-    repo_connect = GithubConnect()
-    repo = repo_connect.remote_repo
 
-    branches = repo.get_branches()
-    for branch_ in branches:
-        if branch_.name == branch:
-            HEAD = repo.get_commit( str(branch_.commit.sha))
-            return HEAD.sha
+def get_local_refs(ref_prefix, repo_path="."):
+    """Get names of refs from local clone, newest first
+
+    Args:
+        ref_prefix (str): e.g. `refs/tags/`
+        repo_path (Optional[str]): path to local clone
+
+    Returns:
+        list[str]: ref names relative to prefix, empty if path
+            is not a git repository
+    """
+    from git.exc import GitError
+
+    try:
+        output = get_local_git_repo(repo_path).git.for_each_ref(
+            "--sort=-creatordate", "--format=%(refname)", ref_prefix)
+    except GitError as err:
+        printer.debug("Local refs not available: %s", err)
+        return []
+
+    return [
+        line[len(ref_prefix):]
+        for line in output.splitlines()
+        if line.startswith(ref_prefix)
+    ]
+
+
+def get_local_commit(branch, repo_path="."):
+    """Get commit of branch from local clone
+
+    Local branch is preferred over remote tracking `origin` branch.
+
+    Args:
+        branch (str): branch name
+        repo_path (Optional[str]): path to local clone
+
+    Returns:
+        Union[str, None]: commit sha or None if ref is missing
+    """
+    from git.exc import GitError
+
+    try:
+        repo = get_local_git_repo(repo_path)
+    except GitError as err:
+        printer.debug("Local repository not available: %s", err)
+        return None
+
+    for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
+        try:
+            return repo.git.rev_parse(
+                "--verify", "--quiet", f"{ref}^{{commit}}")
+        except GitError:
+            continue
+    return None
+
+
+def _get_refs_query(amount):
+    """Get query resolving heads of `amount` branches at once
+
+    Branch names are passed as variables `$branch0..N` and refs are
+    aliased `branch0..N` in response.
+    """
+    variables = "".join(
+        f", $branch{index}: String!" for index in range(amount))
+    refs = "".join(
+        f"""
+                    branch{index}: ref(qualifiedName: $branch{index}) {{
+                        target {{
+                            oid
+                        }}
+                    }}"""
+        for index in range(amount)
+    )
+    return f"""
+            query (
+                $owner: String!, $repo_name: String!{variables}
+            ){{
+                repository(owner: $owner, name: $repo_name) {{{refs}
+                }}
+                rateLimit {{
+                    cost
+                    remaining
+                    resetAt
+                }}
+            }}
+        """
+
+
+def get_latest_commits(branches, source="api", repo_path=".", context=None):
+    """Get head commits of branches
+
+    Branches missing in local clone (or all with `api` source) are
+    resolved with one Github GraphQL request.
+
+    Args:
+        branches (list[str]): branch names
+        source (Optional[str]): `api` or `local`
+        repo_path (Optional[str]): path to local clone
+        context (Optional[RepositoryContext]): repository connection
+
+    Returns:
+        dict[str, Union[str, None]]: commit sha by branch name, None
+            if branch does not exist
+    """
+    from graphql_client import run_github_query
+
+    commits = {}
+    if source == "local":
+        for branch in branches:
+            commit_sha = get_local_commit(branch, repo_path)
+            if commit_sha:
+                commits[branch] = commit_sha
+            else:
+                printer.debug(
+                    "Branch '%s' missing in local clone, asking Github..",
+                    branch
+                )
+
+    missing = [branch for branch in branches if branch not in commits]
+    if not missing:
+        return commits
+
+    context = get_repo_context(context)
+    variables = {
+        "owner": context.owner,
+        "repo_name": context.name,
+    }
+    for index, branch in enumerate(missing):
+        variables[f"branch{index}"] = f"refs/heads/{branch}"
+
+    result = run_github_query(
+        _get_refs_query(len(missing)), variables,
+        expected_nodes=len(missing), context=context
+    )
+    repository = result["data"]["repository"]
+    for index, branch in enumerate(missing):
+        ref = repository.get(f"branch{index}")
+        commits[branch] = ref["target"]["oid"] if ref else None
+
+    return commits
+
+
+def get_latest_commit(branch, source="api", repo_path=".", context=None):
+    return get_latest_commits([branch], source, repo_path, context)[branch]
 
 
 @click.command(
@@ -74,11 +465,28 @@ def get_latest_commit(branch):
     )
 )
 @click.option(
-    "--branch", required=True,
-    help="branch name"
+    "--branch", "branches", required=True, multiple=True,
+    help=(
+        "branch name, can be used multiple times and "
+        "`branch=sha` lines are printed"
+    )
 )
-def get_latest_commit_cli(branch):
-    printer.echo(f"Branch activated '{branch}'..")
-    commit_sha = get_latest_commit(branch)
-    printer.echo(f"Latest commit '{commit_sha}'..")
-    print(commit_sha)
\ No newline at end of file
+@click.option(
+    "--source", type=click.Choice(["api", "local"]), default="api",
+    show_default=True,
+    help="Read refs from local clone, Github API is used if ref is missing"
+)
+@click.option(
+    "--repo-path", default=".", show_default=True,
+    help="Path to local clone used with `--source=local`"
+)
+def get_latest_commit_cli(branches, source, repo_path):
+    printer.debug("Branches activated '%s'..", branches)
+    commits = get_latest_commits(list(branches), source, repo_path)
+    printer.debug("Latest commits '%s'..", commits)
+    if len(branches) == 1:
+        print(commits[branches[0]])
+        return
+
+    for branch in branches:
+        print(f"{branch}={commits[branch]}")
@@ -1,16 +1,245 @@
+import os
+import json
+import tempfile
+import logging
 import click
 
+LOGGER_NAME = "ci_tools"
+LOG_LEVELS = ["debug", "info", "warning", "error"]
+
+
+def get_cache_dir():
+    """Get directory of ci-tools persistent caches
+
+    Returns:
+        str: path to directory
+    """
+    cache_dir = os.getenv("CI_TOOLS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "ci-tools"
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def write_json_file(path, data, **kwargs):
+    """Atomically replace json file
+
+    Data are written to unique temporary file next to `path` which is
+    then moved over `path`, so concurrent writers (threads or processes)
+    never leave partially written file.
+
+    Args:
+        path (str): json file path
+        data (Any): json serializable data
+        **kwargs: arguments of `json.dump`, e.g. `indent`
+    """
+    dirpath = os.path.dirname(path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirpath or None,
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **kwargs)
+        # mkstemp creates file readable only by owner
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def parse_log_levels(values):
+    """Parse log levels in form `level` or `module=level`
+
+    Args:
+        values (list[str]): levels, items can be comma separated
+
+    Returns:
+        tuple[Union[str, None], dict]: global level and levels per module
+    """
+    level = None
+    module_levels = {}
+    for value in values:
+        for item in value.split(","):
+            item = item.strip().lower()
+            if not item:
+                continue
+            module, _, module_level = item.rpartition("=")
+            if module_level not in LOG_LEVELS:
+                raise click.BadParameter(
+                    f"Unknown log level '{module_level}', "
+                    f"use one of {LOG_LEVELS}"
+                )
+            if module:
+                module_levels[module] = module_level
+            else:
+                level = module_level
+    return level, module_levels
+
+
+class LazyFormat:
+    """Formatting deferred until the log message is emitted
+
+    Args:
+        func (Callable): formatting function, e.g. `pformat`
+        *args: arguments of the function
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+class JsonFormatter(logging.Formatter):
+    """One json object per record for CI log processing"""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname.lower(),
+            "module": record.name.replace(f"{LOGGER_NAME}.", "", 1),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class _EchoHandler(logging.Handler):
+    """Emit to stderr with `click.echo` so redirected streams (daemon)
+    are used and logs do not mix with command output on stdout
+    """
+
+    def emit(self, record):
+        try:
+            click.echo(self.format(record), err=True)
+        except Exception:
+            self.handleError(record)
+
 
 class Printer:
-    ctx: click.Context
+    """Logger of a module
+
+    Messages are formatted only when level of the module is enabled, so
+    pass arguments separately (`printer.debug("PRs %s", pulls)`) and wrap
+    expensive formatting into `LazyFormat`.
+
+    Args:
+        name (Optional[str]): module name, use `__name__`
+    """
+    ctx: click.Context = None
+    _handler: logging.Handler = None
+
+    def __init__(self, name=None):
+        if not name or name == "__main__":
+            name = "cli"
+        self.logger = logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+    def is_enabled(self, level="debug"):
+        return self.logger.isEnabledFor(getattr(logging, level.upper()))
+
+    def debug(self, message, *args):
+        self.logger.debug(message, *args)
 
-    def __init__(self):
-        pass
+    def info(self, message, *args):
+        self.logger.info(message, *args)
+
+    def warning(self, message, *args):
+        self.logger.warning(message, *args)
+
+    def error(self, message, *args):
+        self.logger.error(message, *args)
 
     def echo(self, message):
-        if self.ctx.obj["DEBUG"]:
-            click.echo(message)
+        """Debug message, kept for backward compatibility"""
+        self.logger.debug("%s", message)
 
     @classmethod
     def set_context(cls, ctx):
-        cls.ctx = ctx
\ No newline at end of file
+        cls.ctx = ctx
+        level = ctx.obj.get("LOG_LEVEL") or "warning"
+        if ctx.obj.get("DEBUG"):
+            level = "debug"
+        cls.configure(
+            level,
+            module_levels=ctx.obj.get("LOG_MODULE_LEVELS"),
+            json_format=ctx.obj.get("LOG_FORMAT") == "json"
+        )
+
+    @classmethod
+    def configure(cls, level="warning", module_levels=None, json_format=False):
+        """Set levels and output format of all module loggers
+
+        Args:
+            level (str): level of all modules
+            module_levels (Optional[dict]): levels overriding `level`
+                per module name
+            json_format (bool): output json lines instead of text
+        """
+        root = logging.getLogger(LOGGER_NAME)
+        if cls._handler is None:
+            cls._handler = _EchoHandler()
+            root.addHandler(cls._handler)
+            root.propagate = False
+
+        cls._handler.setFormatter(
+            JsonFormatter() if json_format
+            else logging.Formatter("%(message)s")
+        )
+        root.setLevel(level.upper())
+
+        # reset levels from previous configuration (daemon mode)
+        prefix = f"{LOGGER_NAME}."
+        for name, logger in logging.Logger.manager.loggerDict.items():
+            if name.startswith(prefix) and isinstance(logger, logging.Logger):
+                logger.setLevel(logging.NOTSET)
+
+        for module, module_level in (module_levels or {}).items():
+            logging.getLogger(f"{prefix}{module}").setLevel(
+                module_level.upper())
+
+
+class LazyGroup(click.Group):
+    """Click group importing its subcommands only when invoked
+
+    Args:
+        lazy_subcommands (dict): command name mapped to import path
+            `module.attribute` of the click command
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        base = super().list_commands(ctx)
+        lazy = sorted(self.lazy_subcommands.keys())
+        return base + lazy
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _lazy_load(self, cmd_name):
+        import importlib
+
+        import_path = self.lazy_subcommands[cmd_name]
+        modname, cmd_object_name = import_path.rsplit(".", 1)
+        mod = importlib.import_module(modname)
+        cmd_object = getattr(mod, cmd_object_name)
+        if not isinstance(cmd_object, click.Command):
+            raise ValueError(
+                f"Lazy loading of '{import_path}' failed by returning "
+                "a non-command object"
+            )
+        return cmd_object
@@ -1,81 +1,653 @@
+import os
 import re
+import glob
+import json
+import bisect
+import shutil
+import tempfile
 import click
 import tomlkit
+from concurrent.futures import ThreadPoolExecutor
 from semver import VersionInfo
-from repository import GithubConnect
+from repository import get_repo_context, get_local_refs
 
-from utils import Printer
+from utils import Printer, write_json_file
 
-printer = Printer()
+printer = Printer(__name__)
 
 
 def remove_prefix(text, prefix):
     return text[text.startswith(prefix) and len(prefix):]
 
 
-def get_last_version(type):
-    repo = GithubConnect().remote_repo
+class TagResolver:
+    """Resolving latest version tag from Github refs
 
-    version_types = {
-        "CI": "^CI/[0-9\.]*",
-        "release": "^[0-9\.]*"
-    }
-
-    pattern = re.compile(version_types[type])
+    Github is asked only for refs under the prefix of the version type,
+    newest commit first, and paging stops at the first matching tag.
 
-    tags = []
-    for tag in repo.get_tags():
-        match_obj = pattern.match(tag.name)
-        # QUESTION: didn't find better way to do this
-        if not match_obj:
-            continue
-        match = match_obj.group(0)
-        if not match:
-            continue
-        tags.append(tag.name)
+    Args:
+        type (str): type of version tag (CI or release)
+        page_size (Optional[int]): refs requested per page
+        context (Optional[RepositoryContext]): repository connection
+    """
 
-    tag = tags[0]
+    version_types = {
+        "CI": r"^CI/[0-9\.]*",
+        "release": r"^[0-9\.]*"
+    }
+    ref_prefixes = {
+        "CI": "refs/tags/CI/",
+        "release": "refs/tags/"
+    }
 
+    query = """
+            query (
+                $owner: String!, $repo_name: String!, $prefix: String!,
+                $first: Int!, $cursor: String
+            ){
+                repository(owner: $owner, name: $repo_name) {
+                    refs(
+                        refPrefix: $prefix, first: $first, after: $cursor,
+                        orderBy: {field: TAG_COMMIT_DATE, direction: DESC}
+                    ){
+                        pageInfo {
+                            hasNextPage
+                            endCursor
+                        }
+                        nodes {
+                            name
+                        }
+                    }
+                }
+                rateLimit {
+                    cost
+                    remaining
+                    resetAt
+                }
+            }
+        """
+
+    def __init__(self, type, page_size=100, context=None):
+        self.type = type
+        self.page_size = page_size
+        self.repo_connect = get_repo_context(context)
+        self.pattern = re.compile(self.version_types[type])
+        self.pages_consumed = 0
+
+    def iter_tags(self):
+        """Iterate tag names, newest first
+
+        Yields:
+            str: tag name
+        """
+        from graphql_client import run_github_query
+
+        prefix = self.ref_prefixes[self.type]
+        # refs are named relative to prefix
+        name_prefix = remove_prefix(prefix, "refs/tags/")
+        variables = {
+            "owner": self.repo_connect.owner,
+            "repo_name": self.repo_connect.name,
+            "prefix": prefix,
+            "first": self.page_size,
+            "cursor": None
+        }
+        while True:
+            result = run_github_query(
+                self.query, variables, expected_nodes=self.page_size,
+                context=self.repo_connect
+            )
+            self.pages_consumed += 1
+            refs = result["data"]["repository"]["refs"]
+            for node in refs["nodes"]:
+                yield name_prefix + node["name"]
+
+            if not refs["pageInfo"]["hasNextPage"]:
+                return
+            variables["cursor"] = refs["pageInfo"]["endCursor"]
+
+    def get_latest_tag(self, line=None):
+        """Get latest tag matching version type
+
+        Args:
+            line (Optional[str]): `X` or `X.Y` version line the tag
+                version has to belong to
+
+        Returns:
+            str: tag name
+
+        Raises:
+            ValueError: no tag of the type was found
+        """
+        parts = parse_version_line(line) if line else None
+        for tag in self.iter_tags():
+            match_obj = self.pattern.match(tag)
+            if not match_obj or not match_obj.group(0):
+                continue
+            if parts and not is_tag_in_line(tag, parts):
+                continue
+            printer.debug(
+                "Tag '%s' resolved in %s pages", tag, self.pages_consumed)
+            return tag
+
+        raise ValueError(
+            f"No '{self.type}' version tag found"
+            + (f" in line '{line}'" if line else "")
+            + f" in {self.pages_consumed} pages"
+        )
+
+
+VERSION_LINE_PATTERN = re.compile(r"\d+(\.\d+)?")
+
+
+def parse_version_line(line):
+    """Parse version line
+
+    Args:
+        line (str): `X` or `X.Y` version line
+
+    Returns:
+        list[int]: major and optionally minor version
+
+    Raises:
+        ValueError: line is not in form `X` or `X.Y`
+    """
+    if not VERSION_LINE_PATTERN.fullmatch(line):
+        raise ValueError(
+            f"Version line '{line}' is not in form `X` or `X.Y`")
+    return [int(part) for part in line.split(".")]
+
+
+def is_tag_in_line(tag, parts):
+    """Check whether version of tag belongs to version line
+
+    Args:
+        tag (str): tag name, `CI/` prefix is allowed
+        parts (list[int]): parsed version line
+
+    Returns:
+        bool: tag is semver of the line
+    """
+    try:
+        version = VersionInfo.parse(remove_prefix(tag, "CI/"))
+    except ValueError:
+        return False
+    return [version.major, version.minor][:len(parts)] == parts
+
+
+def validate_version_line(ctx, param, value):
+    """Click callback of `--line` option"""
+    if value is not None:
+        try:
+            parse_version_line(value)
+        except ValueError as err:
+            raise click.BadParameter(str(err))
+    return value
+
+
+class TagIndex:
+    """Semver ordered index of version tags
+
+    Versions are kept sorted so latest version (of a line) is found with
+    binary search. Index persisted at `path` is synced incrementally,
+    only tags newer (by commit date) than the last seen one are fetched.
+
+    Tags pointing to commits older than the last seen tag are not picked
+    up by incremental sync, use `sync(full=True)` in that case. Index is
+    rebuilt from fetched tags when the last seen tag does not exist
+    anymore (deleted or moved tag).
+
+    Args:
+        type (str): type of version tag (CI or release)
+        path (Optional[str]): json file of persisted index
+        context (Optional[RepositoryContext]): repository connection
+    """
+
+    def __init__(self, type, path=None, context=None):
+        self.type = type
+        self.path = path
+        self.context = context
+        self.pattern = re.compile(TagResolver.version_types[type])
+        self.versions: list[VersionInfo] = []
+        self.tags: list[str] = []
+        self.last_seen = None
+        self._known = set()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    @classmethod
+    def get_default_path(cls, type, context=None):
+        from utils import get_cache_dir
+
+        context = get_repo_context(context)
+        return os.path.join(
+            get_cache_dir(), "tags",
+            context.owner, context.name, f"{type}.json"
+        )
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        self.last_seen = data.get("last_seen")
+        for tag in data.get("tags", []):
+            self.add(tag)
+
+    def save(self):
+        if not self.path:
+            return
+        write_json_file(
+            self.path, {"last_seen": self.last_seen, "tags": self.tags})
+
+    def add(self, tag):
+        """Insert tag at its semver position
+
+        Args:
+            tag (str): tag name
+
+        Returns:
+            bool: tag was added
+        """
+        match_obj = self.pattern.match(tag)
+        if not match_obj or not match_obj.group(0) or tag in self._known:
+            return False
+
+        try:
+            version = VersionInfo.parse(remove_prefix(tag, "CI/"))
+        except ValueError:
+            printer.debug("Skipping tag '%s', not a semver", tag)
+            return False
+
+        index = bisect.bisect_right(self.versions, version)
+        self.versions.insert(index, version)
+        self.tags.insert(index, tag)
+        self._known.add(tag)
+        return True
+
+    def sync(self, full=False):
+        """Fetch tags from Github newer than last seen one
+
+        Args:
+            full (Optional[bool]): drop index and fetch all tags
+
+        Returns:
+            int: amount of added tags
+        """
+        if full:
+            self.versions, self.tags, self._known = [], [], set()
+            self.last_seen = None
+
+        resolver = TagResolver(self.type, context=self.context)
+        fetched = []
+        found = self.last_seen is None
+        for tag in resolver.iter_tags():
+            if tag == self.last_seen:
+                found = True
+                break
+            fetched.append(tag)
+
+        if not found:
+            # all tags were fetched, index may contain removed tags
+            printer.info(
+                "Last seen tag '%s' not found, rebuilding tag index '%s'",
+                self.last_seen, self.type
+            )
+            self.versions, self.tags, self._known = [], [], set()
+            self.last_seen = None
+
+        added = sum(int(self.add(tag)) for tag in fetched)
+        if fetched:
+            self.last_seen = fetched[0]
+        printer.debug(
+            "Tag index '%s' synced, %s added in %s pages",
+            self.type, added, resolver.pages_consumed
+        )
+        if fetched or not found:
+            self.save()
+        return added
+
+    def latest(self, line=None):
+        """Get latest version, optionally of version line
+
+        Args:
+            line (Optional[str]): `X` or `X.Y` version line
+
+        Returns:
+            Union[tuple[VersionInfo, str], None]: version and tag name
+        """
+        index = len(self.versions)
+        if line:
+            parts = parse_version_line(line)
+            if len(parts) == 1:
+                upper = VersionInfo(parts[0] + 1, 0, 0, "0")
+            else:
+                upper = VersionInfo(parts[0], parts[1] + 1, 0, "0")
+            # `-0` is the lowest pre-release of the upper version
+            index = bisect.bisect_left(self.versions, upper)
+
+        if not index:
+            return None
+
+        version = self.versions[index - 1]
+        if line and [version.major, version.minor][:len(parts)] != parts:
+            return None
+        return version, self.tags[index - 1]
+
+    def next_bump(self, part, line=None):
+        """Get next version after latest version
+
+        Args:
+            part (str): semver part to bump
+            line (Optional[str]): `X` or `X.Y` version line
+
+        Returns:
+            Union[VersionInfo, None]: next version
+        """
+        latest = self.latest(line)
+        if latest is None:
+            return None
+        return latest[0].next_version(part)
+
+
+def get_local_tag_index(type, repo_path="."):
+    """Get index of version tags found in local clone
+
+    Args:
+        type (str): type of version tag (CI or release)
+        repo_path (Optional[str]): path to local clone
+
+    Returns:
+        TagIndex: not persisted index
+    """
+    index = TagIndex(type)
+    prefix = TagResolver.ref_prefixes[type]
+    name_prefix = remove_prefix(prefix, "refs/tags/")
+    for name in get_local_refs(prefix, repo_path):
+        index.add(name_prefix + name)
+    return index
+
+
+def get_last_version(
+    type, source="api", repo_path=".", line=None, tag_index=True,
+    context=None, full_sync=False
+):
+    latest = None
+    if source == "local":
+        latest = get_local_tag_index(type, repo_path).latest(line)
+        if latest is None:
+            printer.debug(
+                "No '%s' tag in local clone, asking Github..", type)
+
+    if latest is None and tag_index:
+        context = get_repo_context(context)
+        index = TagIndex(
+            type, TagIndex.get_default_path(type, context), context)
+        index.sync(full=full_sync)
+        latest = index.latest(line)
+    elif latest is None:
+        # newest tag by commit date, without semver ordering
+        tag = TagResolver(type, context=context).get_latest_tag(line)
+        latest = (None, tag)
+
+    if latest is None:
+        raise ValueError(
+            f"No '{type}' version tag found"
+            + (f" in line '{line}'" if line else "")
+        )
+
+    _, tag = latest
     if type == "CI":
         return remove_prefix(tag, "CI/"), tag
     else:
         return tag, tag
 
 
+SEMVER_PATTERN = re.compile(
+    r"(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(-((0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(\.(0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(\+([0-9a-zA-Z-]+(\.[0-9a-zA-Z-]+)*))?"
+)
+# only `version = "x.y.z"` assignment of addon package.py
+PACKAGE_VERSION_PATTERN = re.compile(
+    r"^(version\s*=\s*[\"'])" + SEMVER_PATTERN.pattern + r"([\"'])",
+    re.MULTILINE
+)
+
+
+def write_file_atomic(filename, text):
+    """Write file through temp file renamed over the original
+
+    Readers never see partially written file and file mode is kept.
+
+    Args:
+        filename (str): path to file
+        text (str): new content
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname, prefix=f".{os.path.basename(filename)}.")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(text)
+        shutil.copymode(filename, tmp_path)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _read_file(filename):
+    # keep line endings as they are
+    with open(filename, "r", newline="") as f:
+        return f.read()
+
+
 def file_regex_replace_py(filename, regex, version):
-    with open(filename, 'r+') as f:
-        text = f.read()
-        text = re.sub(regex, version, text)
+    """Replace all matches of regex in file by version
+
+    Returns:
+        bool: file was changed
+    """
+    text = _read_file(filename)
+    new_text = re.sub(regex, str(version), text)
+    if new_text == text:
+        return False
+    write_file_atomic(filename, new_text)
+    return True
+
+
+def file_regex_replace_package(filename, version):
+    """Replace version assignment of addon package.py
+
+    Returns:
+        bool: file was changed
+    """
+    text = _read_file(filename)
+    new_text = PACKAGE_VERSION_PATTERN.sub(
+        lambda match: (
+            match.group(1) + str(version) + match.group(match.re.groups)
+        ),
+        text
+    )
+    if new_text == text:
+        return False
+    write_file_atomic(filename, new_text)
+    return True
 
-        f.seek(0)
-        f.write(text)
-        f.truncate()
 
-def file_regex_replace_toml(filename, version):
-    with open(filename,'r') as fr:
-        data = tomlkit.load(fr)
+POETRY_TABLE_PATTERN = re.compile(
+    r"^[ \t]*\[[ \t]*tool[ \t]*\.[ \t]*poetry[ \t]*\][ \t]*(#[^\r\n]*)?\r?$",
+    re.MULTILINE
+)
+TABLE_HEADER_PATTERN = re.compile(r"^[ \t]*\[", re.MULTILINE)
+TOML_VERSION_PATTERN = re.compile(
+    r"^[ \t]*version[ \t]*=[ \t]*"
+    r"(?:\"(?P<basic>[^\"\\\n]*)\"|'(?P<literal>[^'\n]*)')"
+    r"[ \t]*(#[^\r\n]*)?\r?$",
+    re.MULTILINE
+)
+
+
+def set_poetry_version_span(text, version):
+    """Replace only the value of `version` in `[tool.poetry]` table
+
+    Formatting of the rest of the file is kept byte for byte.
+
+    Args:
+        text (str): pyproject.toml content
+        version (str): new version
+
+    Returns:
+        Union[str, None]: new content or None when the file can't be
+            edited safely (multi-line strings, dotted or inline tables,
+            duplicated keys...)
+    """
+    # lines of multi-line strings could look like tables or keys
+    if '"""' in text or "'''" in text:
+        return None
+
+    tables = list(POETRY_TABLE_PATTERN.finditer(text))
+    if len(tables) != 1:
+        return None
+
+    start = tables[0].end()
+    next_table = TABLE_HEADER_PATTERN.search(text, start)
+    end = next_table.start() if next_table else len(text)
+
+    matches = list(TOML_VERSION_PATTERN.finditer(text, start, end))
+    if len(matches) != 1:
+        return None
+
+    group = "basic" if matches[0].group("basic") is not None else "literal"
+    value_start, value_end = matches[0].span(group)
+    return text[:value_start] + str(version) + text[value_end:]
+
+
+def set_poetry_version_tomlkit(text, version):
+    """Set `tool.poetry.version` by parsing and dumping whole document"""
+    data = tomlkit.parse(text)
 
     # Modify only version
     data["tool"]["poetry"]["version"] = str(version)
 
-    with open(filename,'w') as fw:
-        tomlkit.dump(data, fw)
+    return tomlkit.dumps(data)
+
 
+def file_regex_replace_toml(filename, version):
+    """Set `tool.poetry.version` of pyproject.toml
 
+    Version value is replaced in place, whole document is parsed with
+    tomlkit only when the file can't be edited safely that way.
 
-def bump_file_versions(version, version_path, pyproject_path):
+    Returns:
+        bool: file was changed
+    """
+    text = _read_file(filename)
+    new_text = set_poetry_version_span(text, version)
+    if new_text is None:
+        printer.debug("Editing '%s' with tomlkit", filename)
+        new_text = set_poetry_version_tomlkit(text, version)
+
+    if new_text == text:
+        return False
+    write_file_atomic(filename, new_text)
+    return True
 
-    regex = "(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(-((0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(\.(0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(\+([0-9a-zA-Z-]+(\.[0-9a-zA-Z-]+)*))?"
-    file_regex_replace_py(version_path, regex, version)
+
+def bump_file_version(version, filename):
+    """Bump version in file, handler is picked by file name
+
+    - `pyproject.toml`: poetry version
+    - `package.py`: `version = "..."` assignment
+    - any other: all semver strings (e.g. `version.py`)
+
+    Returns:
+        bool: file was changed
+    """
+    basename = os.path.basename(filename)
+    if basename == "pyproject.toml":
+        return file_regex_replace_toml(filename, version)
+    if basename == "package.py":
+        return file_regex_replace_package(filename, version)
+    return file_regex_replace_py(filename, SEMVER_PATTERN, version)
+
+
+def bump_file_versions(version, version_path, pyproject_path):
+    file_regex_replace_py(version_path, SEMVER_PATTERN, version)
 
     # bump pyproject.toml
     file_regex_replace_toml(pyproject_path, version)
 
 
+def get_version_files(patterns, root="."):
+    """Get files matching glob patterns
+
+    Args:
+        patterns (list[str]): glob patterns, `**` is recursive
+        root (Optional[str]): directory patterns are relative to
+
+    Returns:
+        list[str]: sorted normalized paths, files matched by more
+            patterns or through symlinks are listed once
+    """
+    paths = {}
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            if os.path.isfile(path):
+                paths.setdefault(
+                    os.path.realpath(path), os.path.normpath(path))
+    return sorted(paths.values())
+
+
+def read_version_manifest(manifest_path):
+    """Read glob patterns from manifest, one per line
+
+    Empty lines and lines starting with `#` are skipped.
+
+    Returns:
+        list[str]: glob patterns
+    """
+    with open(manifest_path, "r") as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def bump_files_version(version, paths, max_workers=None):
+    """Bump version in many files concurrently
+
+    Args:
+        version (str): version SemVer string
+        paths (list[str]): files to bump
+        max_workers (Optional[int]): amount of threads
+
+    Returns:
+        list[dict]: report item per file with `path`, `changed`
+            and `error`
+    """
+    def _bump(path):
+        try:
+            return {
+                "path": path,
+                "changed": bump_file_version(version, path),
+                "error": None
+            }
+        except Exception as err:
+            return {"path": path, "changed": False, "error": repr(err)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_bump, paths))
+
+
 @click.command(
     name="bump-file-version",
     help=(
-        "Bump version number inside of version.py and pyproject.toml."
+        "Bump version number inside of version.py and pyproject.toml. "
+        "With `--glob` or `--manifest` all matched version.py, package.py "
+        "and pyproject.toml files are bumped and report is printed."
     )
 )
 @click.option(
@@ -83,24 +655,88 @@ def bump_file_versions(version, version_path, pyproject_path):
     help="Version SemVer string"
 )
 @click.option(
-    "--pyproject-path", required=True,
+    "--pyproject-path", required=False,
     help="Relative/absolute path to pyproject.toml from project root"
 )
 @click.option(
-    "--version-path", required=True,
+    "--version-path", required=False,
     help="Relative/absolute path to version.py from project root"
 )
-def bump_file_versions_cli(version, version_path, pyproject_path):
-    bump_file_versions(version, version_path, pyproject_path)
-
-
-def current_version(type):
-    last_release, _ = get_last_version(type)
+@click.option(
+    "--glob", "patterns", multiple=True,
+    help="Glob pattern of version files, e.g. `addons/*/package.py`"
+)
+@click.option(
+    "--manifest", required=False, type=click.Path(exists=True),
+    help="File with glob pattern per line"
+)
+@click.option(
+    "--root", default=".", show_default=True,
+    help="Directory glob patterns are relative to"
+)
+@click.option(
+    "--workers", required=False, type=click.INT,
+    help="Amount of files processed concurrently"
+)
+@click.option(
+    "--report", "report_path", required=False, type=click.Path(),
+    help="Write json report of bumped files"
+)
+def bump_file_versions_cli(
+    version, version_path, pyproject_path, patterns, manifest, root,
+    workers, report_path
+):
+    patterns = list(patterns)
+    if manifest:
+        patterns.extend(read_version_manifest(manifest))
+
+    if not patterns:
+        if not version_path or not pyproject_path:
+            raise click.UsageError(
+                "Use `--version-path` with `--pyproject-path`, "
+                "or `--glob`/`--manifest`"
+            )
+        bump_file_versions(version, version_path, pyproject_path)
+        return
+
+    paths = get_version_files(patterns, root)
+    real_paths = {os.path.realpath(path) for path in paths}
+    for path in (version_path, pyproject_path):
+        if path and os.path.realpath(path) not in real_paths:
+            real_paths.add(os.path.realpath(path))
+            paths.append(os.path.normpath(path))
+
+    report = bump_files_version(version, paths, workers)
+    for item in report:
+        if item["error"]:
+            status = f"error {item['error']}"
+        else:
+            status = "changed" if item["changed"] else "unchanged"
+        print(f"{item['path']}: {status}")
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if any(item["error"] for item in report):
+        raise click.ClickException("Some version files failed to bump")
+
+
+def current_version(
+    type, source="api", repo_path=".", line=None, tag_index=True,
+    context=None, full_sync=False
+):
+    last_release, _ = get_last_version(
+        type, source, repo_path, line, tag_index, context, full_sync)
     return last_release
 
 
-def bump_version(type, part):
-    current_version_ = current_version(type)
+def bump_version(
+    type, part, source="api", repo_path=".", line=None, tag_index=True,
+    context=None, full_sync=False
+):
+    current_version_ = current_version(
+        type, source, repo_path, line, tag_index, context, full_sync)
     last_release_v = VersionInfo.parse(current_version_)
     return last_release_v.next_version(part)
 
@@ -122,12 +758,39 @@ def bump_version(type, part):
         "Example: major, minor, patch"
     )
 )
-def bump_version_cli(type, part):
-    new_version = bump_version(type, part)
+@click.option(
+    "--source", type=click.Choice(["api", "local"]), default="api",
+    show_default=True,
+    help="Read tags from local clone, Github API is used if none is found"
+)
+@click.option(
+    "--repo-path", default=".", show_default=True,
+    help="Path to local clone used with `--source=local`"
+)
+@click.option(
+    "--line", required=False, callback=validate_version_line,
+    help="Version line `X` or `X.Y` to take latest version from"
+)
+@click.option(
+    "--tag-index/--no-tag-index", default=True,
+    help=(
+        "Order tags by semver in persisted index synced incrementally, "
+        "otherwise newest tag by commit date is used"
+    )
+)
+@click.option(
+    "--full-sync", is_flag=True, default=False,
+    help="Rebuild tag index from all tags, e.g. after tags were rewritten"
+)
+def bump_version_cli(type, part, source, repo_path, line, tag_index,
+                     full_sync):
+    new_version = bump_version(
+        type, part, source, repo_path, line, tag_index,
+        full_sync=full_sync
+    )
     print(new_version)
 
 
-
 @click.command(
     name="current-version",
     help=(
@@ -138,7 +801,32 @@ def bump_version_cli(type, part):
     "--type", required=True,
     help="Type of version tag (CI or release)"
 )
-def current_version_cli(type):
+@click.option(
+    "--source", type=click.Choice(["api", "local"]), default="api",
+    show_default=True,
+    help="Read tags from local clone, Github API is used if none is found"
+)
+@click.option(
+    "--repo-path", default=".", show_default=True,
+    help="Path to local clone used with `--source=local`"
+)
+@click.option(
+    "--line", required=False, callback=validate_version_line,
+    help="Version line `X` or `X.Y` to take latest version from"
+)
+@click.option(
+    "--tag-index/--no-tag-index", default=True,
+    help=(
+        "Order tags by semver in persisted index synced incrementally, "
+        "otherwise newest tag by commit date is used"
+    )
+)
+@click.option(
+    "--full-sync", is_flag=True, default=False,
+    help="Rebuild tag index from all tags, e.g. after tags were rewritten"
+)
+def current_version_cli(type, source, repo_path, line, tag_index, full_sync):
     print(
-        current_version(type)
+        current_version(
+            type, source, repo_path, line, tag_index, full_sync=full_sync)
     )
\ No newline at end of file